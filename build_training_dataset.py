@@ -60,6 +60,52 @@ def add_dissimilar_pair(product1_name, product2_name, reason='different_product'
     print(f"✗ Added dissimilar pair ({reason}):")
     print(f"  '{product1_name[:60]}' ≠ '{product2_name[:60]}'")
 
+def add_pairs_bulk(similar_pairs, dissimilar_pairs, platform1='amazon', platform2='flipkart'):
+    """
+    Add many training pairs with a single file open/flush
+
+    Args:
+        similar_pairs: List of (product1_name, product2_name) tuples (label 1.0)
+        dissimilar_pairs: List of (product1_name, product2_name, reason) tuples (label 0.0)
+        platform1: Platform of first products
+        platform2: Platform of second products
+    """
+    timestamp = datetime.now().isoformat()
+    lines = []
+
+    for product1_name, product2_name in similar_pairs:
+        lines.append(json.dumps({
+            'sentence1': product1_name.strip(),
+            'sentence2': product2_name.strip(),
+            'label': 1.0,
+            'platform1': platform1,
+            'platform2': platform2,
+            'timestamp': timestamp
+        }, ensure_ascii=False))
+
+    for product1_name, product2_name, reason in dissimilar_pairs:
+        lines.append(json.dumps({
+            'sentence1': product1_name.strip(),
+            'sentence2': product2_name.strip(),
+            'label': 0.0,
+            'reason': reason,
+            'platform1': platform1,
+            'platform2': platform2,
+            'timestamp': timestamp
+        }, ensure_ascii=False))
+
+    if not lines:
+        return
+
+    # One open, one write, one fsync for the whole batch
+    with open(TRAINING_DATA_FILE, 'a', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+    print(f"✓ Added {len(similar_pairs)} similar and {len(dissimilar_pairs)} dissimilar pairs")
+
+
 def view_training_data(limit=10):
     """View current training dataset"""
     if not os.path.exists(TRAINING_DATA_FILE):
@@ -9,6 +9,7 @@ DB_PATH = "./database/price_comparison.db"
 # Tables
 AMAZON_TABLE = "amazon_products"
 FLIPKART_TABLE = "flipkart_products"
+COMPARISON_TABLE = "comparisons"
 
 # Scraper Configuration
 AMAZON_BASE_URL = "https://www.amazon.in/s"
@@ -3,7 +3,7 @@ Database module for storing Amazon and Flipkart product data
 """
 import sqlite3
 import logging
-from config import DB_PATH, AMAZON_TABLE, FLIPKART_TABLE
+from config import DB_PATH, AMAZON_TABLE, FLIPKART_TABLE, COMPARISON_TABLE
 from utils import get_timestamp
 
 logger = logging.getLogger(__name__)
@@ -21,6 +21,10 @@ class Database:
         try:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row
+            # WAL mode (set once in init_database) persists in the db file;
+            # busy_timeout and synchronous are per-connection
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA synchronous=NORMAL")
             return conn
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}")
@@ -33,7 +37,10 @@ class Database:
             return
         
         cursor = conn.cursor()
-        
+
+        # WAL allows concurrent readers during writes and cheaper commits
+        cursor.execute("PRAGMA journal_mode=WAL")
+
         # Create Amazon table
         cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS {AMAZON_TABLE} (
@@ -64,6 +71,21 @@ class Database:
             )
         """)
         
+        # Create comparison results table
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {COMPARISON_TABLE} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT,
+                query TEXT,
+                platform TEXT,
+                product_name TEXT,
+                price TEXT,
+                url TEXT,
+                rating TEXT,
+                similarity_score REAL
+            )
+        """)
+
         conn.commit()
         conn.close()
         logger.info("Database tables initialized successfully")
@@ -112,6 +134,36 @@ class Database:
         finally:
             conn.close()
     
+    def insert_comparisons(self, rows):
+        """
+        Insert comparison result rows in a single transaction
+        Args:
+            rows: list of dicts with timestamp, query, platform, product_name,
+                  price, url, rating and similarity_score keys
+        """
+        if not rows:
+            return True
+
+        conn = self.get_connection()
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            cursor.executemany(f"""
+                INSERT INTO {COMPARISON_TABLE}
+                (timestamp, query, platform, product_name, price, url, rating, similarity_score)
+                VALUES (:timestamp, :query, :platform, :product_name, :price, :url, :rating, :similarity_score)
+            """, rows)
+            conn.commit()
+            logger.info(f"Inserted {len(rows)} comparison rows")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error inserting comparison rows: {e}")
+            return False
+        finally:
+            conn.close()
+
     def search_product(self, product_name):
         """
         Search for product in both tables
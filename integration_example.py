@@ -5,7 +5,10 @@ This file demonstrates how to integrate product_matcher.py into your
 existing scraper pipeline with minimal changes.
 """
 
+import json
 import logging
+import os
+from functools import lru_cache
 from typing import List, Dict, Optional
 
 # Import your existing modules
@@ -14,10 +17,62 @@ from flipkart_scraper import FlipkartScraper
 from database import Database
 
 # Import the new product matcher
-from product_matcher import filter_products, enhance_scraper_results
+from product_matcher import (
+    filter_products,
+    enhance_scraper_results,
+    get_embedding,
+    cosine_similarity,
+)
 
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# Scrape cache
+# ============================================================================
+# Threshold sweeps and before/after comparisons re-run the same scrape for
+# every pass; the network fetch + BeautifulSoup parse dominates that cost.
+# Parsed results are cached per (platform, query) with a TTL so repeated
+# passes share one scrape without serving stale, stock-sensitive data.
+
+_SCRAPE_CACHE_TTL_SECONDS = 600
+_SCRAPE_CACHE_MAX_ENTRIES = 256
+_scrape_cache: Dict[tuple, tuple] = {}
+
+
+def _fetch_and_parse(platform: str, query: str) -> List[Dict]:
+    """
+    Fetch and parse a search page, caching results per (platform, query).
+
+    Args:
+        platform (str): 'amazon' or 'flipkart'
+        query (str): Product search query
+
+    Returns:
+        List[Dict]: Parsed products (shallow copy of the cached list)
+    """
+    import time
+
+    key = (platform, query.strip().lower())
+    cached = _scrape_cache.get(key)
+    if cached is not None:
+        fetched_at, products = cached
+        if time.time() - fetched_at < _SCRAPE_CACHE_TTL_SECONDS:
+            logger.info(f"Using cached {platform} results for: {query}")
+            return list(products)
+        del _scrape_cache[key]
+
+    scraper = AmazonScraper() if platform == 'amazon' else FlipkartScraper()
+    soup = scraper.fetch_page(query)
+    products = scraper.parse_products(soup) if soup else []
+
+    # Keep the cache bounded; evict the oldest entry once full
+    if len(_scrape_cache) >= _SCRAPE_CACHE_MAX_ENTRIES:
+        oldest_key = min(_scrape_cache, key=lambda k: _scrape_cache[k][0])
+        del _scrape_cache[oldest_key]
+
+    _scrape_cache[key] = (time.time(), tuple(products))
+    return list(products)
+
 
 # ============================================================================
 # EXAMPLE 1: Basic Usage - Filter products from a single platform
@@ -35,17 +90,9 @@ def search_amazon_with_matching(product_name: str, threshold: float = 0.80):
         >>> matched = search_amazon_with_matching("iPhone 14")
         >>> # Returns: iPhone 14, iPhone 14 Pro (case excluded by filter_products)
     """
-    scraper = AmazonScraper()
-    
-    # Step 1: Scrape products using keyword-based search
+    # Step 1: Scrape products using keyword-based search (cached per query)
     logger.info(f"Scraping Amazon for: {product_name}")
-    soup = scraper.fetch_page(product_name)
-    
-    if not soup:
-        logger.error("Failed to fetch Amazon page")
-        return []
-    
-    scraped_products = scraper.parse_products(soup)
+    scraped_products = _fetch_and_parse('amazon', product_name)
     logger.info(f"Found {len(scraped_products)} products on Amazon")
     
     # Step 2: Filter using semantic matching (NEW!)
@@ -69,7 +116,8 @@ def search_amazon_with_matching(product_name: str, threshold: float = 0.80):
 def search_both_platforms_with_matching(
     product_name: str,
     similarity_threshold: float = 0.80,
-    max_results_per_platform: int = 5
+    max_results_per_platform: int = 5,
+    query_embedding=None
 ) -> Dict[str, List[Dict]]:
     """
     Search both Amazon and Flipkart, then apply semantic matching to both.
@@ -93,37 +141,29 @@ def search_both_platforms_with_matching(
         print(f"    Price: ₹{product.get('price', 'N/A')}\n")
     ----
     """
-    amazon_scraper = AmazonScraper()
-    flipkart_scraper = FlipkartScraper()
-    
     logger.info(f"Searching for: {product_name}")
-    
-    # Step 1: Scrape from both platforms
+
+    # Step 1: Scrape from both platforms (cached per query)
     logger.info("Scraping Amazon...")
-    amazon_soup = amazon_scraper.fetch_page(product_name)
-    amazon_products = (
-        amazon_scraper.parse_products(amazon_soup)
-        if amazon_soup else []
-    )
+    amazon_products = _fetch_and_parse('amazon', product_name)
     logger.info(f"Found {len(amazon_products)} products on Amazon")
-    
+
     logger.info("Scraping Flipkart...")
-    flipkart_soup = flipkart_scraper.fetch_page(product_name)
-    flipkart_products = (
-        flipkart_scraper.parse_products(flipkart_soup)
-        if flipkart_soup else []
-    )
+    flipkart_products = _fetch_and_parse('flipkart', product_name)
     logger.info(f"Found {len(flipkart_products)} products on Flipkart")
     
     # Step 2: Apply semantic filtering to both platforms (NEW!)
+    # The query embedding is computed once (or passed in by the caller) and
+    # shared across both platforms instead of re-encoding per filter call.
     results = enhance_scraper_results(
         user_query=product_name,
         amazon_products=amazon_products,
         flipkart_products=flipkart_products,
         similarity_threshold=similarity_threshold,
-        max_per_platform=max_results_per_platform
+        max_per_platform=max_results_per_platform,
+        query_embedding=query_embedding
     )
-    
+
     return results
 
 
@@ -180,44 +220,139 @@ def search_and_store_matched_products(product_name: str):
 # EXAMPLE 4: Advanced - Customizing similarity threshold
 # ============================================================================
 
+_CALIBRATION_FILE = "calibration.json"
+
+# Fallback ladder, used when no calibrated threshold is available for the
+# query's (word-count bucket, category) combination
+_FALLBACK_THRESHOLDS = {'specific': 0.85, 'generic': 0.75, 'vague': 0.65}
+
+
+def _word_count_bucket(product_name: str) -> str:
+    """Bucket a query by specificity: 'specific', 'generic', or 'vague'."""
+    word_count = len(product_name.split())
+    if word_count >= 4:
+        return 'specific'
+    if word_count >= 2:
+        return 'generic'
+    return 'vague'
+
+
+@lru_cache(maxsize=1)
+def _calibrated_thresholds() -> Dict[tuple, float]:
+    """
+    Compute the best similarity threshold per (bucket, category) from the
+    labeled calibration set.
+
+    For each calibration case, candidate names are embedded once and scored
+    against the query; thresholds from 0.60 to 0.90 (step 0.05) are swept and
+    the one maximizing F1 over all cases in a (bucket, category) group wins.
+    Cached after the first call, so the sweep runs once per process.
+
+    Returns:
+        Dict[tuple, float]: (bucket, category) -> calibrated threshold.
+            Empty if the calibration file or the model is unavailable.
+    """
+    from utils import detect_product_category
+
+    if not os.path.exists(_CALIBRATION_FILE):
+        logger.info(f"Calibration file not found: {_CALIBRATION_FILE}")
+        return {}
+
+    try:
+        with open(_CALIBRATION_FILE, 'r', encoding='utf-8') as f:
+            cases = json.load(f).get('cases', [])
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not load calibration file: {e}")
+        return {}
+
+    sweep = [round(0.60 + 0.05 * i, 2) for i in range(7)]  # 0.60 .. 0.90
+
+    # Group per-case similarity/label pairs by (bucket, category)
+    groups: Dict[tuple, list] = {}
+    try:
+        for case in cases:
+            query = case['query']
+            expected = {name.strip().lower() for name in case['expected_matches']}
+            query_emb = get_embedding(query)
+
+            key = (_word_count_bucket(query), detect_product_category(query))
+            scored = groups.setdefault(key, [])
+            for name in case['candidates']:
+                similarity = cosine_similarity(query_emb, get_embedding(name))
+                scored.append((similarity, name.strip().lower() in expected))
+    except Exception as e:
+        # Model unavailable (e.g., sentence-transformers not installed)
+        logger.warning(f"Threshold calibration skipped: {e}")
+        return {}
+
+    # Pick the threshold maximizing F1 within each group
+    thresholds = {}
+    for key, scored in groups.items():
+        best_tau, best_f1 = None, -1.0
+        for tau in sweep:
+            tp = sum(1 for sim, relevant in scored if sim >= tau and relevant)
+            fp = sum(1 for sim, relevant in scored if sim >= tau and not relevant)
+            fn = sum(1 for sim, relevant in scored if sim < tau and relevant)
+            denominator = 2 * tp + fp + fn
+            f1 = (2 * tp / denominator) if denominator else 0.0
+            if f1 > best_f1:
+                best_tau, best_f1 = tau, f1
+        thresholds[key] = best_tau
+        logger.info(
+            f"Calibrated threshold for {key}: {best_tau} (F1: {best_f1:.3f})"
+        )
+
+    return thresholds
+
+
 def search_with_custom_threshold(
     product_name: str,
     similarity_threshold: Optional[float] = None
 ) -> Dict[str, List[Dict]]:
     """
     Search with different thresholds based on product specificity.
-    
+
     General products (e.g., "headphones"): Lower threshold (0.70)
     Specific models (e.g., "Sony WH-1000XM5"): Higher threshold (0.85)
-    
+
     This helps balance between:
     - High precision: 0.85+ (only very similar products)
     - Balanced: 0.75-0.85 (good mix of precision & recall)
     - High recall: 0.65-0.75 (captures variations)
+
+    The threshold is taken from the calibration table (see calibration.json)
+    for the query's (specificity bucket, category); the word-count ladder is
+    only used when no calibrated value exists.
     """
-    # Auto-detect threshold based on product specificity
+    # Auto-detect threshold: calibrated table first, word-count ladder fallback
     if similarity_threshold is None:
-        word_count = len(product_name.split())
-        
-        if word_count >= 4:
-            # Specific model name (e.g., "Sony WH-1000XM5 Black")
-            similarity_threshold = 0.85
-            logger.info("Detected specific model name - using threshold: 0.85")
-        
-        elif word_count >= 2:
-            # Generic product with brand (e.g., "Sony headphones")
-            similarity_threshold = 0.75
-            logger.info("Detected generic product - using threshold: 0.75")
-        
+        from utils import detect_product_category
+
+        bucket = _word_count_bucket(product_name)
+        category = detect_product_category(product_name)
+
+        similarity_threshold = _calibrated_thresholds().get((bucket, category))
+        if similarity_threshold is not None:
+            logger.info(
+                f"Using calibrated threshold {similarity_threshold} "
+                f"for ({bucket}, {category})"
+            )
         else:
-            # Very generic (e.g., "headphones")
-            similarity_threshold = 0.65
-            logger.info("Detected very generic product - using threshold: 0.65")
-    
+            similarity_threshold = _FALLBACK_THRESHOLDS[bucket]
+            logger.info(
+                f"No calibrated threshold for ({bucket}, {category}) - "
+                f"using fallback: {similarity_threshold}"
+            )
+    
+    # Encode the query once; search_both_platforms_with_matching reuses it
+    # for both platforms instead of re-embedding product_name per call.
+    query_embedding = get_embedding(product_name)
+
     return search_both_platforms_with_matching(
         product_name,
         similarity_threshold=similarity_threshold,
-        max_results_per_platform=5
+        max_results_per_platform=5,
+        query_embedding=query_embedding
     )
 
 
@@ -231,44 +366,56 @@ def compare_keyword_vs_semantic_matching(product_name: str):
     
     Useful for testing and validation.
     """
-    amazon_scraper = AmazonScraper()
-    
-    # Get scraped products (keyword-based)
-    soup = amazon_scraper.fetch_page(product_name)
-    keyword_results = amazon_scraper.parse_products(soup) if soup else []
-    
-    print("\n" + "="*80)
-    print("KEYWORD-BASED SEARCH (Before Semantic Matching)")
-    print("="*80)
-    for i, product in enumerate(keyword_results[:10], 1):
-        print(f"{i}. {product['product_name'][:70]}")
-        print(f"   Price: ₹{product.get('price', 'N/A')}\n")
-    
-    # Apply semantic matching
+    # Get scraped products (keyword-based); the cache lets the "before"
+    # keyword view and the "after" semantic view share a single scrape
+    keyword_results = _fetch_and_parse('amazon', product_name)
+    
+    # Build each report section as a list of lines and emit it with a single
+    # print call - one syscall per section instead of one per product line.
+    lines = [
+        "\n" + "="*80,
+        "KEYWORD-BASED SEARCH (Before Semantic Matching)",
+        "="*80,
+    ]
+    lines.extend(
+        f"{i}. {product['product_name'].ljust(70)[:70]}\n"
+        f"   Price: ₹{product.get('price', 'N/A')}\n"
+        for i, product in enumerate(keyword_results[:10], 1)
+    )
+    print("\n".join(lines))
+
+    # Apply semantic matching (query encoded once, reused for any re-runs)
+    query_embedding = get_embedding(product_name)
     semantic_results = filter_products(
         product_name,
         keyword_results,
         similarity_threshold=0.80,
         exclude_accessories=True,
-        max_results=10
+        max_results=10,
+        query_embedding=query_embedding
     )
-    
-    print("\n" + "="*80)
-    print("SEMANTIC-BASED SEARCH (After Semantic Matching)")
-    print("="*80)
-    for i, product in enumerate(semantic_results, 1):
-        score = product.get('similarity_score', 0)
-        print(f"{i}. {product['product_name'][:70]}")
-        print(f"   Similarity: {score:.2%}")
-        print(f"   Price: ₹{product.get('price', 'N/A')}\n")
-    
-    print("\n" + "="*80)
-    print("FILTERING IMPACT")
-    print("="*80)
-    print(f"Keyword results: {len(keyword_results)} products")
-    print(f"Semantic results: {len(semantic_results)} products")
-    print(f"Filtered out: {len(keyword_results) - len(semantic_results)} products")
-    print("="*80 + "\n")
+
+    lines = [
+        "\n" + "="*80,
+        "SEMANTIC-BASED SEARCH (After Semantic Matching)",
+        "="*80,
+    ]
+    lines.extend(
+        f"{i}. {product['product_name'].ljust(70)[:70]}\n"
+        f"   Similarity: {product.get('similarity_score', 0):.2%}\n"
+        f"   Price: ₹{product.get('price', 'N/A')}\n"
+        for i, product in enumerate(semantic_results, 1)
+    )
+    lines.extend([
+        "\n" + "="*80,
+        "FILTERING IMPACT",
+        "="*80,
+        f"Keyword results: {len(keyword_results)} products",
+        f"Semantic results: {len(semantic_results)} products",
+        f"Filtered out: {len(keyword_results) - len(semantic_results)} products",
+        "="*80 + "\n",
+    ])
+    print("\n".join(lines))
 
 
 # ============================================================================
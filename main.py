@@ -1,844 +1,1432 @@
-"""
-Main application module for Price Comparison
-"""
-import logging
-import os
-from database import Database
-from amazon_scraper import AmazonScraper
-from flipkart_scraper import FlipkartScraper
-from excel_reporter import ExcelReporter
-from product_matcher import filter_products
-from utils import setup_logging, compare_products, extract_product_details, find_matching_product_list, detect_product_category
-
-# Setup logging
-setup_logging()
-logger = logging.getLogger(__name__)
-
-def normalize_product_name(name):
-    """
-    Normalize product name for comparison
-    Args:
-        name: Product name to normalize
-    Returns:
-        str: Normalized name (lowercase, trimmed)
-    """
-    return name.strip().lower()
-
-def extract_numeric_value(value_str):
-    """
-    Extract numeric value from a string like '45 g', '45g', '45gm', '1.5 oz'
-    Args:
-        value_str: String containing number and unit
-    Returns:
-        tuple: (numeric_value, unit) or (None, None)
-    """
-    if not value_str:
-        return None, None
-    
-    import re
-    # Extract number and unit
-    match = re.search(r'(\d+\.?\d*)\s*([a-z]+)', value_str.lower().strip())
-    if match:
-        numeric = float(match.group(1))
-        unit = match.group(2)
-        # Normalize units
-        unit_map = {'g': 'g', 'gm': 'g', 'gram': 'g', 'oz': 'oz', 'ounce': 'oz', 'ml': 'ml', 'cc': 'ml'}
-        normalized_unit = unit_map.get(unit, unit)
-        return numeric, normalized_unit
-    return None, None
-
-def weights_match(weight1, weight2):
-    """
-    Check if two weight values match (numerically)
-    Args:
-        weight1: First weight string (e.g., '45 g')
-        weight2: Second weight string (e.g., '45g')
-    Returns:
-        bool: True if weights match, False otherwise
-    """
-    if not weight1 or not weight2:
-        return False
-    
-    num1, unit1 = extract_numeric_value(weight1)
-    num2, unit2 = extract_numeric_value(weight2)
-    
-    if num1 is None or num2 is None:
-        # Fallback to string comparison if parsing fails
-        return weight1.lower() == weight2.lower()
-    
-    # Units must match
-    if unit1 != unit2:
-        return False
-    
-    # Numeric values must match (with tiny tolerance for floating point)
-    return abs(num1 - num2) < 0.01
-
-def calculate_name_similarity(name1, name2):
-    """
-    Calculate similarity between two product names using semantic matching
-    Args:
-        name1: First product name
-        name2: Second product name
-    Returns:
-        tuple: (is_identical, similarity_score)
-    """
-    norm1 = normalize_product_name(name1)
-    norm2 = normalize_product_name(name2)
-    
-    # First check: Are they exactly the same?
-    if norm1 == norm2:
-        logger.debug(f"  [EXACT MATCH] '{norm1}'")
-        return True, 100
-    
-    # Split into meaningful words (exclude short words and common articles)
-    common_words = {'the', 'a', 'an', 'and', 'or', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'from', '-', '–'}
-    
-    words1 = [w for w in norm1.split() if len(w) > 2 and w.lower() not in common_words]
-    words2 = [w for w in norm2.split() if len(w) > 2 and w.lower() not in common_words]
-    
-    if not words1 or not words2:
-        logger.debug(f"  [NO MATCH] Empty word list: {words1} vs {words2}")
-        return False, 0
-    
-    # LENIENT HANDLING FOR INCOMPLETE PRODUCT NAMES
-    # If one name has only 1-2 words (likely incomplete extraction), be more lenient
-    short_name_threshold = 2
-    if len(words1) <= short_name_threshold or len(words2) <= short_name_threshold:
-        # If all keywords from short name are in long name, consider it a match
-        shorter_words = words1 if len(words1) <= len(words2) else words2
-        longer_words = words2 if len(words1) <= len(words2) else words1
-        
-        # Check if all words from shorter name exist in longer name
-        overlap = sum(1 for word in shorter_words if word in longer_words)
-        overlap_percentage = (overlap / len(shorter_words)) * 100 if shorter_words else 0
-        
-        if overlap_percentage >= 100:  # All words from short name must be in long name
-            logger.debug(f"  [LENIENT MATCH] Short name match: {overlap_percentage:.0f}%")
-            return False, 75  # Not identical, but good match
-        else:
-            logger.debug(f"  [LENIENT MISMATCH] Short name only {overlap_percentage:.0f}% overlap")
-            return False, overlap_percentage
-    
-    # Both lists should have similar length (within 30% for better compatibility)
-    length_diff = abs(len(words1) - len(words2))
-    max_len = max(len(words1), len(words2))
-    
-    # Calculate overlap
-    overlap = sum(1 for word in words1 if word in words2)
-    overlap_percentage = (overlap / max_len) * 100 if max_len > 0 else 0
-    
-    # More lenient: require 70%+ overlap instead of 95%
-    if overlap_percentage >= 70:
-        logger.debug(f"  [SIMILARITY MATCH {overlap_percentage:.0f}%]")
-        return False, overlap_percentage
-    
-    # Default: not a match
-    logger.debug(f"  [SIMILARITY MISMATCH] Only {overlap_percentage:.0f}% overlap")
-    return False, overlap_percentage
-
-def rank_products_by_similarity(products, search_query):
-    """
-    Rank products by similarity to search query
-    Args:
-        products: List of products with 'product_name' key
-        search_query: Search query string
-    Returns:
-        list: Products ranked by similarity score (highest first)
-    """
-    search_keywords = set(search_query.lower().split())
-    ranked = []
-    
-    for prod in products:
-        name = prod['product_name'].lower()
-        prod_keywords = set(name.split())
-        
-        # Calculate similarity: how many search keywords are in product name
-        matching_keywords = len(search_keywords & prod_keywords)
-        similarity_score = (matching_keywords / len(search_keywords)) * 100 if search_keywords else 0
-        
-        ranked.append({
-            'product': prod,
-            'similarity_score': similarity_score,
-            'matching_keywords': matching_keywords
-        })
-    
-    # Sort by similarity score (highest first)
-    ranked.sort(key=lambda x: x['similarity_score'], reverse=True)
-    return ranked
-
-def display_top_products(amazon_ranked, flipkart_ranked, search_query):
-    """
-    Display top 10 products from each site and allow user to select
-    Args:
-        amazon_ranked: Ranked Amazon products
-        flipkart_ranked: Ranked Flipkart products
-        search_query: Original search query
-    Returns:
-        None
-    """
-    print("\n" + "="*100)
-    print(f"TOP MATCHING PRODUCTS FOR: '{search_query}'")
-    print("="*100)
-    
-    print("\nAMAZON (Top 10):")
-    print("-" * 100)
-    for i, item in enumerate(amazon_ranked[:10], 1):
-        prod = item['product']
-        score = item['similarity_score']
-        print(f"{i}. [{score:.0f}%] {prod['product_name'][:85]}")
-        print(f"   Price: ₹{prod.get('price', 'N/A')}")
-    
-    print("\nFLIPKART (Top 10):")
-    print("-" * 100)
-    for i, item in enumerate(flipkart_ranked[:10], 1):
-        prod = item['product']
-        score = item['similarity_score']
-        print(f"{i}. [{score:.0f}%] {prod['product_name'][:85]}")
-        print(f"   Price: ₹{prod.get('price', 'N/A')}")
-    
-    print("\n" + "="*100)
-    print("WARNING - The search is VAGUE - please select matching products:")
-    print("  - Example: 'portronics earphones' matches 5+ different models")
-    print("  - Try: 'portronics conch theta' for specific model")
-    print("="*100 + "\n")
-
-def find_best_matching_pair(amazon_results, flipkart_results, search_query=None):
-    """
-    Find the best matching product pair by semantic similarity
-    
-    MATCHING CRITERIA (in order of importance):
-    1. Category must match (e.g., phone vs phone)
-    2. Brand must match exactly
-    3. Base model/name must be >= 70% similar
-    4. STORAGE CAPACITY MUST MATCH EXACTLY (if present in both)
-    5. COLOR MUST MATCH EXACTLY (if present in both)
-    6. Size/Weight/Dimensions should match if specified
-    
-    This ensures we compare "iPhone 17 Pro 256GB Cosmic Orange" with 
-    "Apple iPhone 17 Pro (Cosmic Orange, 256GB)" and NOT with 
-    "Apple iPhone 17 Pro (Deep Blue, 256GB)"
-    
-    Args:
-        amazon_results: List of Amazon products
-        flipkart_results: List of Flipkart products
-        search_query: Original search query (for ranking)
-    Returns:
-        tuple: (amazon_product, flipkart_product, match_quality)
-    """
-    if not amazon_results or not flipkart_results:
-        return None, None, "no_results"
-    
-    # Rank products by similarity to search query
-    if search_query:
-        amazon_ranked = rank_products_by_similarity(amazon_results, search_query)
-        flipkart_ranked = rank_products_by_similarity(flipkart_results, search_query)
-    else:
-        amazon_ranked = [{'product': p, 'similarity_score': 100} for p in amazon_results]
-        flipkart_ranked = [{'product': p, 'similarity_score': 100} for p in flipkart_results]
-    
-    best_match = None
-    best_score = 0
-    best_name_similarity = 0
-    best_spec_match_details = {}
-    match_quality = "no_match"
-    
-    logger.info(f"\n{'='*70}")
-    logger.info(f"SEMANTIC PRODUCT MATCHING")
-    logger.info(f"{'='*70}")
-    logger.info(f"Matching {len(amazon_results)} Amazon vs {len(flipkart_results)} Flipkart products")
-    logger.info(f"Search Query: {search_query}")
-    logger.info(f"{'='*70}\n")
-    
-    # Try to find matches
-    for amazon_item in amazon_ranked:
-        amazon_prod = amazon_item['product']
-        amazon_base, amazon_color, amazon_storage, amazon_size, amazon_weight, amazon_dims, amazon_brand = extract_product_details(amazon_prod['product_name'])
-        amazon_category = detect_product_category(amazon_prod['product_name'])
-        
-        # DEBUG: Log extracted details
-        logger.debug(f"\nAmazon product analysis:")
-        logger.debug(f"  Name: {amazon_prod['product_name'][:80]}")
-        logger.debug(f"  Extracted - Brand: {amazon_brand}, Color: '{amazon_color}', Storage: {amazon_storage}GB, Category: {amazon_category}")
-        
-        for flipkart_item in flipkart_ranked:
-            flipkart_prod = flipkart_item['product']
-            flipkart_base, flipkart_color, flipkart_storage, flipkart_size, flipkart_weight, flipkart_dims, flipkart_brand = extract_product_details(flipkart_prod['product_name'])
-            flipkart_category = detect_product_category(flipkart_prod['product_name'])
-            
-            # DEBUG: Log extracted details
-            logger.debug(f"  Flipkart product analysis:")
-            logger.debug(f"    Name: {flipkart_prod['product_name'][:80]}")
-            logger.debug(f"    Extracted - Brand: {flipkart_brand}, Color: '{flipkart_color}', Storage: {flipkart_storage}GB, Category: {flipkart_category}")
-            
-            match_score = 0
-            rejection_reason = None
-            match_details = {
-                'category_match': False,
-                'brand_match': False,
-                'name_similarity': 0,
-                'storage_match': False,
-                'color_match': False,
-                'size_match': False,
-                'weight_match': False,
-            }
-            
-            # ===== STEP 0: PRODUCT CATEGORY MUST BE COMPATIBLE =====
-            if amazon_category != flipkart_category:
-                if amazon_category != 'general' and flipkart_category != 'general':
-                    rejection_reason = f"Category mismatch: {amazon_category} vs {flipkart_category}"
-                    continue
-            match_details['category_match'] = True
-            match_score += 5
-            
-            # ===== STEP 1: BRAND MUST MATCH =====
-            if amazon_brand.lower() != flipkart_brand.lower():
-                rejection_reason = f"Brand mismatch: {amazon_brand} vs {flipkart_brand}"
-                continue
-            match_details['brand_match'] = True
-            match_score += 20
-            logger.debug(f"✓ Brand match: {amazon_brand}")
-            
-            # ===== STEP 2: BASE NAME SIMILARITY (must be >= 70%) =====
-            is_identical, similarity = calculate_name_similarity(amazon_base, flipkart_base)
-            match_details['name_similarity'] = similarity
-            
-            # Accept match if similarity is 70% or higher (lenient for incomplete product names)
-            if similarity < 70:
-                rejection_reason = f"Name similarity too low: {similarity:.0f}% (required: 70%)"
-                continue
-            
-            match_score += (similarity / 5)  # Max 20 points
-            logger.debug(f"✓ Name similarity: {similarity:.0f}%")
-            
-            # ===== STEP 2.5: PRODUCT VARIANT CHECK - Ensure same product variants =====
-            # Key variant descriptors that distinguish different product models
-            variant_keywords = {
-                'matte_type': ['matte lock', 'very matte', 'ultra matte', 'matte finish', 'semi-matte'],
-                'phone_size': ['pro', 'max', 'mini', 'plus', 'ultra'],
-                'material': ['titanium', 'stainless', 'aluminum', 'ceramic'],
-            }
-            
-            # Extract variants from both product names
-            amazon_lower = amazon_base.lower()
-            flipkart_lower = flipkart_base.lower()
-            
-            variant_mismatch = False
-            for category, keywords in variant_keywords.items():
-                # Find which variant (if any) each product has
-                amazon_variant = [kw for kw in keywords if kw in amazon_lower]
-                flipkart_variant = [kw for kw in keywords if kw in flipkart_lower]
-                
-                # If both have variants, they must match
-                if amazon_variant and flipkart_variant:
-                    if amazon_variant != flipkart_variant:
-                        # Different variants in same category - likely different products
-                        rejection_reason = f"Product variant mismatch ({category}): {amazon_variant} vs {flipkart_variant}"
-                        logger.debug(f"  [VARIANT MISMATCH] {rejection_reason}")
-                        variant_mismatch = True
-                        break
-                # If one has a variant and the other doesn't (for key categories), also reject
-                elif (amazon_variant or flipkart_variant) and category in ['phone_size', 'material']:
-                    # One has variant, other doesn't - different products
-                    rejection_reason = f"Product variant missing ({category}): {amazon_variant if amazon_variant else 'none'} vs {flipkart_variant if flipkart_variant else 'none'}"
-                    logger.debug(f"  [VARIANT MISMATCH] {rejection_reason}")
-                    variant_mismatch = True
-                    break
-            
-            if variant_mismatch:
-                continue
-            
-            # ===== STEP 3: STORAGE - MUST MATCH EXACTLY (IF BOTH HAVE IT) =====
-            # Only enforce storage matching if BOTH products have storage extracted from their names
-            # If only one has storage info in the name, that's OK - products may not include it in the title
-            if amazon_storage and flipkart_storage:
-                # Both have storage extracted - must match exactly
-                if amazon_storage != flipkart_storage:
-                    rejection_reason = f"Storage capacity mismatch: {amazon_storage}GB vs {flipkart_storage}GB"
-                    continue
-                
-                match_details['storage_match'] = True
-                match_score += 25  # High priority
-                logger.debug(f"✓ Storage match: {amazon_storage}GB")
-            elif amazon_storage or flipkart_storage:
-                # Only one has storage in the name - this is not a rejection, just note it
-                logger.debug(f"⚠ Only one product has storage in name (A:{amazon_storage}, F:{flipkart_storage})")
-            
-            # ===== STEP 4: COLOR - MUST MATCH EXACTLY (CRITICAL) =====
-            if amazon_color or flipkart_color:
-                # Normalize color comparison
-                amazon_color_norm = amazon_color.strip().lower() if amazon_color else ""
-                flipkart_color_norm = flipkart_color.strip().lower() if flipkart_color else ""
-                
-                # If one has color, both should have color for proper matching
-                if amazon_color_norm and flipkart_color_norm:
-                    # Both have colors - must match exactly
-                    if amazon_color_norm != flipkart_color_norm:
-                        rejection_reason = f"Color mismatch: '{amazon_color}' vs '{flipkart_color}'"
-                        continue
-                    match_details['color_match'] = True
-                    match_score += 20  # High priority
-                    logger.debug(f"✓ Color match: {amazon_color}")
-                elif amazon_color_norm or flipkart_color_norm:
-                    # Only one has color extracted - this is a mismatch
-                    rejection_reason = f"Color availability mismatch: A has '{amazon_color}', F has '{flipkart_color}'"
-                    continue
-            
-            # ===== STEP 5: SIZE - SHOULD MATCH (for cosmetics/packages) =====
-            if amazon_size or flipkart_size:
-                if amazon_size and flipkart_size:
-                    try:
-                        if float(amazon_size) == float(flipkart_size):
-                            match_details['size_match'] = True
-                            match_score += 10
-                            logger.debug(f"✓ Size match: {amazon_size}")
-                        else:
-                            logger.debug(f"⚠ Size mismatch: {amazon_size} vs {flipkart_size} (not critical for this match)")
-                    except (ValueError, TypeError):
-                        logger.debug(f"⚠ Could not compare sizes: {amazon_size} vs {flipkart_size}")
-            
-            # ===== STEP 6: WEIGHT - SHOULD MATCH (for cosmetics) =====
-            if amazon_weight or flipkart_weight:
-                if amazon_weight and flipkart_weight:
-                    if weights_match(amazon_weight, flipkart_weight):
-                        match_details['weight_match'] = True
-                        match_score += 10
-                        logger.debug(f"✓ Weight match: {amazon_weight}")
-            
-            # ===== EXCELLENT MATCH FOUND =====
-            if match_score > best_score:
-                best_score = match_score
-                best_name_similarity = similarity
-                best_match = (amazon_prod, flipkart_prod)
-                best_spec_match_details = match_details
-                
-                logger.info(f"\n[BEST MATCH CANDIDATE] Score: {best_score:.1f}")
-                logger.info(f"  Amazon:  {amazon_prod['product_name']}")
-                logger.info(f"  Flipkart: {flipkart_prod['product_name']}")
-                logger.info(f"  Details: {match_details}")
-    
-    logger.info(f"\n{'='*70}")
-    if best_match:
-        # Determine match quality based on criteria met
-        criteria_met = sum([
-            best_spec_match_details.get('brand_match', False),
-            best_spec_match_details.get('storage_match', False),
-            best_spec_match_details.get('color_match', False),
-            best_spec_match_details.get('size_match', False),
-        ])
-        
-        if (best_spec_match_details.get('storage_match') and 
-            best_spec_match_details.get('color_match')):
-            match_quality = "perfect"
-        elif criteria_met >= 3 and best_name_similarity >= 80:
-            match_quality = "excellent"
-        elif criteria_met >= 2 and best_name_similarity >= 70:
-            match_quality = "good"
-        elif criteria_met >= 1 and best_name_similarity >= 60:
-            match_quality = "partial"
-        else:
-            match_quality = "weak"
-        
-        logger.info(f"[FINAL RESULT] Match Quality: {match_quality.upper()} (Score: {best_score:.1f})")
-        logger.info(f"  Amazon:  {best_match[0]['product_name']}")
-        logger.info(f"  Flipkart: {best_match[1]['product_name']}")
-        logger.info(f"{'='*70}\n")
-        
-        if best_name_similarity >= 50:
-            return best_match[0], best_match[1], match_quality
-    
-    # No acceptable match found
-    logger.warning(f"\n{'='*70}")
-    logger.warning(f"NO PERFECT MATCH FOUND")
-    logger.warning(f"Attempting intelligent fallback matching...")
-    logger.warning(f"{'='*70}\n")
-    
-    if search_query:
-        display_top_products(amazon_ranked, flipkart_ranked, search_query)
-    
-    # FALLBACK PRIORITY 1: COLOR + STORAGE match (most important)
-    # Even if brand name extraction differs (iPhone vs Apple), match on these specs
-    best_by_color_storage = None
-    best_flipkart_by_color_storage = None
-    
-    for amazon_item in amazon_ranked:
-        amazon_prod = amazon_item['product']
-        amazon_base, amazon_color, amazon_storage, _, _, _, amazon_brand = extract_product_details(amazon_prod['product_name'])
-        
-        for flipkart_item in flipkart_ranked:
-            flipkart_prod = flipkart_item['product']
-            flipkart_base, flipkart_color, flipkart_storage, _, _, _, flipkart_brand = extract_product_details(flipkart_prod['product_name'])
-            
-            # Match by COLOR + STORAGE (ignoring brand extraction issues)
-            base_name_match = calculate_name_similarity(amazon_base, flipkart_base)[1] >= 70
-            
-            amazon_color_norm = amazon_color.strip().lower() if amazon_color else ""
-            flipkart_color_norm = flipkart_color.strip().lower() if flipkart_color else ""
-            color_match = (amazon_color_norm and flipkart_color_norm and amazon_color_norm == flipkart_color_norm)
-            
-            storage_match = amazon_storage and flipkart_storage and amazon_storage == flipkart_storage
-            
-            # CRITICAL: Color + Storage match on same model
-            if color_match and storage_match and base_name_match:
-                best_by_color_storage = amazon_prod
-                best_flipkart_by_color_storage = flipkart_prod
-                
-                logger.warning(f"\n✓ FALLBACK LEVEL 1: Color + Storage match found!")
-                logger.warning(f"  Color: {amazon_color} | Storage: {amazon_storage}GB")
-                logger.warning(f"  Amazon:  {best_by_color_storage['product_name'][:70]}")
-                logger.warning(f"  Flipkart: {best_flipkart_by_color_storage['product_name'][:70]}\n")
-                break
-        
-        if best_by_color_storage:
-            break
-    
-    if best_by_color_storage and best_flipkart_by_color_storage:
-        logger.warning(f"Using FALLBACK LEVEL 1 (color + storage match):")
-        logger.warning(f"  Amazon: {best_by_color_storage['product_name'][:70]}")
-        logger.warning(f"  Flipkart: {best_flipkart_by_color_storage['product_name'][:70]}")
-        return best_by_color_storage, best_flipkart_by_color_storage, "color_storage_match"
-    
-    # SECOND FALLBACK: Try to find at least COLOR match (if storage doesn't match perfectly)
-    # This is more intelligent - we check if products are the same MODEL, then match COLOR
-    best_by_color_only = None
-    best_by_color_only_flipkart = None
-    
-    for amazon_item in amazon_ranked:
-        amazon_prod = amazon_item['product']
-        amazon_base, amazon_color, amazon_storage, _, _, _, amazon_brand = extract_product_details(amazon_prod['product_name'])
-        
-        for flipkart_item in flipkart_ranked:
-            flipkart_prod = flipkart_item['product']
-            flipkart_base, flipkart_color, flipkart_storage, _, _, _, flipkart_brand = extract_product_details(flipkart_prod['product_name'])
-            
-            # SMART MATCHING: Check if base names are similar (model match) FIRST
-            # This handles "iPhone 17 Pro" vs "Apple iPhone 17 Pro" 
-            # Use 60% threshold here since we're just checking base model, not full product name
-            base_name_match = calculate_name_similarity(amazon_base, flipkart_base)[1] >= 60
-            
-            # Then check for COLOR match
-            amazon_color_norm = amazon_color.strip().lower() if amazon_color else ""
-            flipkart_color_norm = flipkart_color.strip().lower() if flipkart_color else ""
-            color_match = (amazon_color_norm and flipkart_color_norm and amazon_color_norm == flipkart_color_norm)
-            
-            # Key improvement: Match on base name + color, NOT requiring brand to match
-            # because brand extraction is inconsistent between Amazon and Flipkart
-            if base_name_match and color_match:
-                best_by_color_only = amazon_prod
-                best_by_color_only_flipkart = flipkart_prod
-                
-                logger.warning(f"\n⚠ SECOND LEVEL FALLBACK (Color match found):")
-                logger.warning(f"  Amazon Color: '{amazon_color}' | Storage: {amazon_storage}GB")
-                logger.warning(f"  Flipkart Color: '{flipkart_color}' | Storage: {flipkart_storage}GB")
-                logger.warning(f"  Amazon:  {best_by_color_only['product_name'][:70]}")
-                logger.warning(f"  Flipkart: {best_by_color_only_flipkart['product_name'][:70]}\n")
-                break
-        
-        if best_by_color_only:
-            break
-    
-    if best_by_color_only and best_by_color_only_flipkart:
-        logger.warning(f"Using second-level fallback (color match only):")
-        logger.warning(f"  Amazon: {best_by_color_only['product_name'][:70]}")
-        logger.warning(f"  Flipkart: {best_by_color_only_flipkart['product_name'][:70]}")
-        logger.warning(f"⚠️  WARNING: Storage capacity differs - prices may not be comparable\n")
-        return best_by_color_only, best_by_color_only_flipkart, "color_match_only"
-    
-    # Last resort: Return top-ranked products with STRONG warning
-    if amazon_ranked and flipkart_ranked:
-        top_amazon = amazon_ranked[0]['product']
-        top_flipkart = flipkart_ranked[0]['product']
-        a_base, a_color, a_storage, _, _, _, _ = extract_product_details(top_amazon['product_name'])
-        f_base, f_color, f_storage, _, _, _, _ = extract_product_details(top_flipkart['product_name'])
-        
-        logger.warning(f"\n⛔ LAST RESORT FALLBACK - NO ACCEPTABLE MATCH FOUND:")
-        logger.warning(f"  Amazon: {top_amazon['product_name'][:70]}")
-        logger.warning(f"    Color: '{a_color}' | Storage: {a_storage}GB")
-        logger.warning(f"  Flipkart: {top_flipkart['product_name'][:70]}")
-        logger.warning(f"    Color: '{f_color}' | Storage: {f_storage}GB")
-        logger.warning(f"\n⛔ CRITICAL WARNING:")
-        logger.warning(f"   - Colors DO NOT MATCH ({a_color} vs {f_color})")
-        logger.warning(f"   - Storage capacity may differ ({a_storage}GB vs {f_storage}GB)")
-        logger.warning(f"   - This comparison may not be valid!")
-        logger.warning(f"   - Please try a more specific search query\n")
-        return top_amazon, top_flipkart, "partial_match_with_mismatches"
-    
-    return None, None, "no_match"
-
-
-class PriceComparator:
-    """Main application class for price comparison"""
-    
-    def __init__(self):
-        """Initialize the application"""
-        self.db = Database()
-        self.amazon_scraper = AmazonScraper()
-        self.flipkart_scraper = FlipkartScraper()
-        self.excel_reporter = ExcelReporter()
-        logger.info("Price Comparator initialized")
-    
-    def search_and_compare(self, product_name):
-        """
-        Search for product in database or scrape if not found
-        Args:
-            product_name: Product to search
-        Returns:
-            dict: Comparison results
-        """
-        logger.info(f"Starting search for: {product_name}")
-        
-        # Search in database
-        db_result = self.db.search_product(product_name)
-        
-        amazon_data = None
-        flipkart_data = None
-        from_database = True
-        
-        # Check if both products are in database
-        if db_result and db_result['amazon'] and db_result['flipkart']:
-            logger.info("Products found in database")
-            amazon_data = db_result['amazon']
-            flipkart_data = db_result['flipkart']
-        else:
-            # Need to scrape
-            logger.info("Products not in database, scraping...")
-            from_database = False
-            
-            # Scrape Amazon
-            amazon_raw = self.amazon_scraper.search(product_name)
-            amazon_results = filter_products(product_name, amazon_raw, similarity_threshold=0.65)
-            # Scrape Flipkart
-            flipkart_raw = self.flipkart_scraper.search(product_name)
-            flipkart_results = filter_products(product_name, flipkart_raw, similarity_threshold=0.65)
-            
-            logger.info(f"Amazon returned {len(amazon_results)} results")
-            for i, p in enumerate(amazon_results[:3]):
-                logger.info(f"  Amazon {i+1}: {p['product_name'][:70]}")
-            
-            logger.info(f"Flipkart returned {len(flipkart_results)} results")
-            for i, p in enumerate(flipkart_results[:3]):
-                logger.info(f"  Flipkart {i+1}: {p['product_name'][:70]}")
-            
-            if amazon_results and flipkart_results:
-                # Find best matching pair by size, color, and other attributes
-                amazon_product, flipkart_product, match_quality = find_best_matching_pair(amazon_results, flipkart_results, product_name)
-                
-                # Store in database
-                if amazon_product:
-                    self.db.insert_amazon_product(
-                        amazon_product['product_name'],
-                        amazon_product['price'],
-                        amazon_product['rating'],
-                        amazon_product['review_count'],
-                        amazon_product['url'],
-                        amazon_product['description']
-                    )
-                    amazon_data = amazon_product
-                
-                if flipkart_product:
-                    self.db.insert_flipkart_product(
-                        flipkart_product['product_name'],
-                        flipkart_product['price'],
-                        flipkart_product['rating'],
-                        flipkart_product['review_count'],
-                        flipkart_product['url'],
-                        flipkart_product['description']
-                    )
-                    flipkart_data = flipkart_product
-            elif amazon_results:
-                # Only Amazon has results
-                amazon_product = amazon_results[0]
-                self.db.insert_amazon_product(
-                    amazon_product['product_name'],
-                    amazon_product['price'],
-                    amazon_product['rating'],
-                    amazon_product['review_count'],
-                    amazon_product['url'],
-                    amazon_product['description']
-                )
-                amazon_data = amazon_product
-                logger.warning("Only Amazon products found, comparison limited to one platform")
-            elif flipkart_results:
-                # Only Flipkart has results
-                flipkart_product = flipkart_results[0]
-                self.db.insert_flipkart_product(
-                    flipkart_product['product_name'],
-                    flipkart_product['price'],
-                    flipkart_product['rating'],
-                    flipkart_product['review_count'],
-                    flipkart_product['url'],
-                    flipkart_product['description']
-                )
-                flipkart_data = flipkart_product
-                logger.warning("Only Flipkart products found, comparison limited to one platform")
-        
-        # Compare products
-        if amazon_data and flipkart_data:
-            comparison = compare_products(amazon_data, flipkart_data)
-            
-            # Add to Excel
-            self.excel_reporter.add_product_comparison(
-                {'amazon': amazon_data, 'flipkart': flipkart_data},
-                comparison
-            )
-            
-            result = {
-                'status': 'success',
-                'from_database': from_database,
-                'amazon': amazon_data,
-                'flipkart': flipkart_data,
-                'comparison': comparison
-            }
-        elif amazon_data or flipkart_data:
-            # Only one platform has data - return partial results
-            result = {
-                'status': 'partial',
-                'message': 'Found on only one platform',
-                'from_database': from_database,
-                'amazon': amazon_data,
-                'flipkart': flipkart_data,
-                'comparison': None
-            }
-        else:
-            result = {
-                'status': 'error',
-                'message': 'Could not find products on both platforms',
-                'amazon': amazon_data,
-                'flipkart': flipkart_data
-            }
-        
-        return result
-    
-    def display_comparison(self, result):
-        """
-        Display comparison results to user
-        Args:
-            result: Comparison result dictionary
-        """
-        print("\n" + "="*80)
-        
-        status = result.get('status')
-        
-        if status == 'error':
-            print(f"Error: {result.get('message', 'Unknown error')}")
-            return
-        
-        if status == 'partial':
-            print("WARNING: Product found on only one platform")
-            print(f"Message: {result.get('message', '')}")
-            print("="*80)
-        else:
-            print(f"PRODUCT COMPARISON RESULTS")
-            print(f"Source: {'Database' if result['from_database'] else 'Web Scraping'}")
-            print("="*80)
-        
-        amazon = result.get('amazon', {})
-        flipkart = result.get('flipkart', {})
-        comparison = result.get('comparison', {})
-        
-        # Amazon Details
-        if amazon:
-            print(f"\nAMAZON:")
-            print(f"  Product:      {amazon.get('product_name', 'N/A')}")
-            print(f"  Price:        {amazon.get('price', 'N/A')}")
-            print(f"  Rating:       {amazon.get('rating', 'N/A')} stars")
-            print(f"  Reviews:      {amazon.get('review_count', 0)}")
-            print(f"  URL:          {amazon.get('url', 'N/A')}")
-        else:
-            print("\nAMAZON: Not found")
-        
-        # Flipkart Details
-        if flipkart:
-            print(f"\nFLIPKART:")
-            print(f"  Product:      {flipkart.get('product_name', 'N/A')}")
-            print(f"  Price:        {flipkart.get('price', 'N/A')}")
-            print(f"  Rating:       {flipkart.get('rating', 'N/A')} stars")
-            print(f"  Reviews:      {flipkart.get('review_count', 0)}")
-            print(f"  URL:          {flipkart.get('url', 'N/A')}")
-        else:
-            print(f"\nFLIPKART: Not found")
-        
-        # Comparison (only if both products exist)
-        if comparison and amazon and flipkart:
-            print(f"\nCOMPARISON & RECOMMENDATION:")
-            print(f"  Cheaper Deal: {comparison.get('cheaper_platform', 'N/A')}")
-            print(f"  Cheaper By:   {comparison.get('cheaper_by_percentage', 0)}%")
-            print(f"  Better Rating:{comparison.get('better_rating_platform', 'N/A')}")
-            print(f"  More Reviews: {comparison.get('better_reviews_platform', 'N/A')}")
-            print(f"\n  RECOMMENDATION: Buy from {comparison.get('recommendation', 'N/A')}")
-        
-        print("\n" + "="*80)
-        if amazon and flipkart:
-            print(f"Excel report updated: {self.excel_reporter.get_file_path()}")
-        print("="*80 + "\n")
-    
-    def show_all_products(self):
-        """Display all products in database"""
-        products = self.db.get_all_products()
-        
-        if not products:
-            print("No products in database")
-            return
-        
-        print("\n" + "="*80)
-        print("ALL PRODUCTS IN DATABASE")
-        print("="*80)
-        
-        print(f"\nAMAZON PRODUCTS ({len(products['amazon'])} items):")
-        for idx, product in enumerate(products['amazon'], 1):
-            print(f"{idx}. {product['product_name']} - ₹{product['price']}")
-        
-        print(f"\nFLIPKART PRODUCTS ({len(products['flipkart'])} items):")
-        for idx, product in enumerate(products['flipkart'], 1):
-            print(f"{idx}. {product['product_name']} - ₹{product['price']}")
-        
-        print("="*80 + "\n")
-    
-    def clear_database(self):
-        """Clear all data from database"""
-        self.db.clear_table('amazon_products')
-        self.db.clear_table('flipkart_products')
-        logger.info("Database cleared")
-        print("Database cleared successfully!")
-
-def main():
-    """Main function to run the application"""
-    print("\n" + "="*80)
-    print("PRICE COMPARISON SYSTEM - AMAZON vs FLIPKART")
-    print("="*80 + "\n")
-    
-    comparator = PriceComparator()
-    
-    while True:
-        print("\nMENU:")
-        print("1. Search & Compare Product")
-        print("2. View All Products in Database")
-        print("3. Clear Database")
-        print("4. Exit")
-        
-        choice = input("\nEnter your choice (1-4): ").strip()
-        
-        if choice == '1':
-            product = input("\nEnter product name to search: ").strip()
-            if product:
-                result = comparator.search_and_compare(product)
-                comparator.display_comparison(result)
-            else:
-                print("Please enter a valid product name!")
-        
-        elif choice == '2':
-            comparator.show_all_products()
-        
-        elif choice == '3':
-            confirm = input("Are you sure? This will delete all data. (yes/no): ").strip().lower()
-            if confirm == 'yes':
-                comparator.clear_database()
-        
-        elif choice == '4':
-            print("\nThank you for using Price Comparison System!")
-            break
-        
-        else:
-            print("Invalid choice! Please try again.")
-
-if __name__ == "__main__":
-    main()
+"""
+Main application module for Price Comparison
+"""
+import logging
+import os
+import re
+import sys
+from collections import OrderedDict, defaultdict
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum, IntFlag
+from functools import lru_cache
+from typing import NamedTuple
+from database import Database
+from amazon_scraper import AmazonScraper
+from flipkart_scraper import FlipkartScraper
+from excel_reporter import ExcelReporter
+from product_matcher import filter_products
+from utils import setup_logging, compare_products, extract_product_details, find_matching_product_list, detect_product_category
+
+# Setup logging
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# RapidFuzz computes the whole name-similarity matrix in C; optional, with a
+# pure-Python fallback so the app still runs without it
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    _rf_fuzz = None
+    _rf_process = None
+
+# Once the matcher columns are integer-encoded, the pair-scoring loop is pure
+# int/float arithmetic and numba can compile it; optional, the Python loop
+# remains the fallback (and the debug path, since the kernel cannot log)
+try:
+    import numpy as _np
+    import numba as _numba
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @_numba.njit(parallel=True, cache=True)
+    def _score_pairs_kernel(sims, cat_a, cat_b, brand_a, brand_b,
+                            storage_a, storage_b, color_a, color_b,
+                            vmask_a, vmask_b, vcat_masks, vcat_strict,
+                            size_a, size_b,
+                            w_present_a, w_present_b, w_parsed_a, w_parsed_b,
+                            w_unit_a, w_unit_b, w_val_a, w_val_b,
+                            w_str_a, w_str_b):
+        """
+        Compiled pair scorer mirroring the Python matching loop
+
+        String columns arrive as dense int ids (0 = missing / 'general'),
+        sizes as floats (NaN = missing or unparseable).  Rows are scored in
+        parallel; the final reduction is serial so ties resolve to the first
+        (i, j) in ranked order, exactly like the Python loop.
+        """
+        n, m = sims.shape
+        row_score = _np.full(n, -1.0)
+        row_j = _np.full(n, -1, dtype=_np.int64)
+        row_bits = _np.zeros(n, dtype=_np.int64)
+
+        for i in _numba.prange(n):
+            best = -1.0
+            best_j = -1
+            best_bits = 0
+            for j in range(m):
+                # Category and brand hard gates
+                if brand_a[i] != brand_b[j]:
+                    continue
+                if cat_a[i] != cat_b[j] and cat_a[i] != 0 and cat_b[j] != 0:
+                    continue
+                sim = sims[i, j]
+                if sim < 70.0:
+                    continue
+                # Variant masks: per-category comparison only when they differ
+                am = vmask_a[i]
+                fm = vmask_b[j]
+                if am != fm:
+                    reject = False
+                    for k in range(vcat_masks.shape[0]):
+                        av = am & vcat_masks[k]
+                        fv = fm & vcat_masks[k]
+                        if av != fv and ((av != 0 and fv != 0) or vcat_strict[k]):
+                            reject = True
+                            break
+                    if reject:
+                        continue
+                bits = 0
+                score = 25.0 + sim / 5.0  # category + brand + name similarity
+                # Storage must match exactly when both sides have it
+                if storage_a[i] != 0 and storage_b[j] != 0:
+                    if storage_a[i] != storage_b[j]:
+                        continue
+                    score += 25.0
+                    bits |= 1
+                # Color must match exactly when present; one-sided color rejects
+                if color_a[i] != 0 or color_b[j] != 0:
+                    if color_a[i] != 0 and color_b[j] != 0:
+                        if color_a[i] != color_b[j]:
+                            continue
+                        score += 20.0
+                        bits |= 2
+                    else:
+                        continue
+                # Size and weight are soft bonuses
+                if size_a[i] == size_b[j]:  # NaN compares unequal
+                    score += 10.0
+                    bits |= 4
+                if w_present_a[i] and w_present_b[j]:
+                    if w_parsed_a[i] and w_parsed_b[j]:
+                        if w_unit_a[i] == w_unit_b[j] and w_val_a[i] == w_val_b[j]:
+                            score += 10.0
+                            bits |= 8
+                    elif w_str_a[i] == w_str_b[j]:
+                        score += 10.0
+                        bits |= 8
+                if score > best:
+                    best = score
+                    best_j = j
+                    best_bits = bits
+                    if best >= _MAX_PAIR_SCORE:
+                        break  # unbeatable for this row
+            row_score[i] = best
+            row_j[i] = best_j
+            row_bits[i] = best_bits
+
+        best_i = -1
+        best_j = -1
+        best_score = 0.0
+        best_bits = 0
+        for i in range(n):
+            if row_score[i] > best_score:
+                best_score = row_score[i]
+                best_i = i
+                best_j = row_j[i]
+                best_bits = row_bits[i]
+        return best_i, best_j, best_score, best_bits
+
+# Product names repeat across matching passes and searches; both helpers
+# re-run regex/string scans on every call, so memoize them per name
+@lru_cache(maxsize=4096)
+def _details_cached(product_name):
+    """Cached wrapper around extract_product_details"""
+    return extract_product_details(product_name)
+
+
+@lru_cache(maxsize=4096)
+def _category_cached(product_name):
+    """Cached wrapper around detect_product_category"""
+    return detect_product_category(product_name)
+
+
+def normalize_product_name(name):
+    """
+    Normalize product name for comparison
+    Args:
+        name: Product name to normalize
+    Returns:
+        str: Normalized name (lowercase, trimmed)
+    """
+    return name.strip().lower()
+
+class MatchFlag(IntFlag):
+    """Bit flags for the per-pair match criteria
+
+    One int per pair instead of a seven-key dict; criteria counting becomes
+    a popcount instead of four dict lookups
+    """
+    CATEGORY = 1
+    BRAND = 2
+    STORAGE = 4
+    COLOR = 8
+    SIZE = 16
+    WEIGHT = 32
+
+
+# Criteria that count toward the final match-quality grade
+_QUALITY_CRITERIA = MatchFlag.BRAND | MatchFlag.STORAGE | MatchFlag.COLOR | MatchFlag.SIZE
+
+# Ceiling of the pair score: category(5) + brand(20) + name(20) + storage(25)
+# + color(20) + size(10) + weight(10).  A pair that reaches it cannot be
+# beaten, so the scorers stop scanning (branch-and-bound cutoff)
+_MAX_PAIR_SCORE = 110.0
+
+
+class MatchQuality(str, Enum):
+    """Match-quality labels returned by find_best_matching_pair
+
+    str mixin (with str's own __str__) so existing callers comparing or
+    printing plain strings keep working unchanged
+    """
+    PERFECT = "perfect"
+    EXCELLENT = "excellent"
+    GOOD = "good"
+    PARTIAL = "partial"
+    WEAK = "weak"
+    NO_MATCH = "no_match"
+    NO_RESULTS = "no_results"
+    COLOR_STORAGE = "color_storage_match"
+    COLOR_ONLY = "color_match_only"
+    LAST_RESORT = "partial_match_with_mismatches"
+
+    __str__ = str.__str__
+
+
+def _flags_to_details(flags, name_similarity):
+    """Expand a MatchFlag bitmask into the legacy match-details dict (used
+    only when logging a best-match candidate)"""
+    return {
+        'category_match': bool(flags & MatchFlag.CATEGORY),
+        'brand_match': bool(flags & MatchFlag.BRAND),
+        'name_similarity': name_similarity,
+        'storage_match': bool(flags & MatchFlag.STORAGE),
+        'color_match': bool(flags & MatchFlag.COLOR),
+        'size_match': bool(flags & MatchFlag.SIZE),
+        'weight_match': bool(flags & MatchFlag.WEIGHT),
+    }
+
+
+# Lowercased strings recur across ranking, matching and variant scans;
+# str.lower allocates a new string per call, so memoize per unique input
+_lower = lru_cache(maxsize=8192)(str.lower)
+
+# Stop words shared by every name-similarity call
+_COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'in', 'on', 'at', 'to', 'for', 'of',
+    'with', 'by', 'is', 'from', '-', '–',
+})
+
+# Precompiled once: extract_numeric_value runs per weight comparison inside
+# the N*M matching loop.  Integer and fractional digits are captured
+# separately so the value can be scaled to integer thousandths of a unit
+_NUM_UNIT_RE = re.compile(r'(\d+)(?:\.(\d+))?\s*([a-z]+)')
+_UNIT_MAP = {'g': 'g', 'gm': 'g', 'gram': 'g', 'oz': 'oz', 'ounce': 'oz', 'ml': 'ml', 'cc': 'ml'}
+
+# Variant descriptors that distinguish different product models.  Each
+# (category, keyword) pair gets its own bit so the per-pair variant check
+# compares two precomputed integer masks instead of rescanning both names
+# for every keyword
+_VARIANT_KEYWORDS = {
+    'matte_type': ['matte lock', 'very matte', 'ultra matte', 'matte finish', 'semi-matte'],
+    'phone_size': ['pro', 'max', 'mini', 'plus', 'ultra'],
+    'material': ['titanium', 'stainless', 'aluminum', 'ceramic'],
+}
+# Categories where a variant present on only one side is enough to reject
+_STRICT_VARIANT_CATEGORIES = frozenset({'phone_size', 'material'})
+
+_VARIANT_FLAGS = []  # flattened [(category, keyword, bit)]
+_VARIANT_CATEGORY_MASKS = {}  # category -> mask covering its keywords' bits
+_bit = 1
+for _cat, _keywords in _VARIANT_KEYWORDS.items():
+    _cat_mask = 0
+    for _kw in _keywords:
+        _VARIANT_FLAGS.append((_cat, _kw, _bit))
+        _cat_mask |= _bit
+        _bit <<= 1
+    _VARIANT_CATEGORY_MASKS[_cat] = _cat_mask
+del _bit, _cat, _keywords, _kw, _cat_mask
+
+
+# Single-pass multi-keyword scanner: a lookahead alternation (longest
+# keyword first) fires at every position, so one C-level scan replaces a
+# separate str.__contains__ pass per keyword.  A hit on a long keyword
+# implies hits on any keywords it contains, so each keyword maps to the
+# closure of its substring keywords' bits
+_VARIANT_SCAN_RE = re.compile(
+    "(?=("
+    + "|".join(re.escape(kw) for _, kw, _ in sorted(_VARIANT_FLAGS, key=lambda f: -len(f[1])))
+    + "))"
+)
+_VARIANT_CLOSURES = {
+    kw: sum(b for _, other, b in _VARIANT_FLAGS if other in kw)
+    for _, kw, _ in _VARIANT_FLAGS
+}
+
+
+@lru_cache(maxsize=4096)
+def _variant_mask(name_lower):
+    """Bitmask of variant keywords present in an already-lowercased name"""
+    mask = 0
+    for match in _VARIANT_SCAN_RE.finditer(name_lower):
+        mask |= _VARIANT_CLOSURES[match.group(1)]
+    return mask
+
+
+def _mask_keywords(mask):
+    """Keywords encoded in a variant bitmask (for rejection messages)"""
+    return [keyword for _, keyword, bit in _VARIANT_FLAGS if mask & bit]
+
+
+@lru_cache(maxsize=4096)
+def extract_numeric_value(value_str):
+    """
+    Extract numeric value from a string like '45 g', '45g', '45gm', '1.5 oz'
+
+    The value is returned as integer thousandths of the unit ('1.5 oz' ->
+    1500), so comparisons are exact integer equality with no float
+    tolerance needed
+    Args:
+        value_str: String containing number and unit
+    Returns:
+        tuple: (scaled_value, unit) or (None, None)
+    """
+    if not value_str:
+        return None, None
+
+    # Extract number and unit
+    match = _NUM_UNIT_RE.search(value_str.lower().strip())
+    if match:
+        int_part, frac_part, unit = match.groups()
+        scaled = int(int_part) * 1000
+        if frac_part:
+            scaled += int(frac_part.ljust(3, '0')[:3])
+        # Normalize units
+        normalized_unit = _UNIT_MAP.get(unit, unit)
+        return scaled, normalized_unit
+    return None, None
+
+def weights_match(weight1, weight2):
+    """
+    Check if two weight values match (numerically)
+    Args:
+        weight1: First weight string (e.g., '45 g')
+        weight2: Second weight string (e.g., '45g')
+    Returns:
+        bool: True if weights match, False otherwise
+    """
+    if not weight1 or not weight2:
+        return False
+
+    num1, unit1 = extract_numeric_value(weight1)
+    num2, unit2 = extract_numeric_value(weight2)
+
+    if num1 is None or num2 is None:
+        # Fallback to string comparison if parsing fails
+        return weight1.lower() == weight2.lower()
+
+    # Fixed-point values: units and scaled integers must match exactly
+    return unit1 == unit2 and num1 == num2
+
+@lru_cache(maxsize=4096)
+def _name_word_set(norm_name):
+    """
+    Meaningful words of a normalized name, memoized per unique name.
+
+    Comparing A Amazon names against B Flipkart names tokenizes each name
+    once (O(A+B)) instead of once per pair (O(A*B)), and the LRU carries
+    the sets across repeated searches.
+    """
+    return frozenset(
+        w for w in norm_name.split() if len(w) > 2 and w not in _COMMON_WORDS
+    )
+
+
+def calculate_name_similarity(name1, name2):
+    """
+    Calculate similarity between two product names using semantic matching
+    Args:
+        name1: First product name
+        name2: Second product name
+    Returns:
+        tuple: (is_identical, similarity_score)
+    """
+    norm1 = normalize_product_name(name1)
+    norm2 = normalize_product_name(name2)
+
+    # First check: Are they exactly the same?
+    if norm1 == norm2:
+        logger.debug(f"  [EXACT MATCH] '{norm1}'")
+        return True, 100
+
+    # C-backed token-set scoring when rapidfuzz is available (same scorer as
+    # the vectorized matrix path, so single-pair and batch scores agree)
+    if _rf_fuzz is not None:
+        if len(norm1.split()) <= 2 or len(norm2.split()) <= 2:
+            # Short/incomplete names keep the lenient containment behavior:
+            # score the short name against the best-matching part of the long one
+            score = _rf_fuzz.partial_token_set_ratio(norm1, norm2)
+        else:
+            score = _rf_fuzz.token_set_ratio(norm1, norm2)
+        logger.debug(f"  [SIMILARITY {score:.0f}%]")
+        return False, score
+
+    # Meaningful words (short words and common articles excluded), tokenized
+    # once per unique name via the memo above
+    words1 = _name_word_set(norm1)
+    words2 = _name_word_set(norm2)
+
+    if not words1 or not words2:
+        logger.debug(f"  [NO MATCH] Empty word list: {words1} vs {words2}")
+        return False, 0
+
+    # LENIENT HANDLING FOR INCOMPLETE PRODUCT NAMES
+    # If one name has only 1-2 words (likely incomplete extraction), be more lenient
+    short_name_threshold = 2
+    if len(words1) <= short_name_threshold or len(words2) <= short_name_threshold:
+        # If all keywords from short name are in long name, consider it a match
+        shorter_words = words1 if len(words1) <= len(words2) else words2
+        longer_words = words2 if len(words1) <= len(words2) else words1
+
+        # Check if all words from shorter name exist in longer name
+        overlap = len(shorter_words & longer_words)
+        overlap_percentage = (overlap / len(shorter_words)) * 100 if shorter_words else 0
+
+        if overlap_percentage >= 100:  # All words from short name must be in long name
+            logger.debug(f"  [LENIENT MATCH] Short name match: {overlap_percentage:.0f}%")
+            return False, 75  # Not identical, but good match
+        else:
+            logger.debug(f"  [LENIENT MISMATCH] Short name only {overlap_percentage:.0f}% overlap")
+            return False, overlap_percentage
+
+    # Both word sets should have similar size (within 30% for better compatibility)
+    max_len = max(len(words1), len(words2))
+
+    # Calculate overlap (set intersection: linear instead of quadratic scan)
+    overlap = len(words1 & words2)
+    overlap_percentage = (overlap / max_len) * 100 if max_len > 0 else 0
+    
+    # More lenient: require 70%+ overlap instead of 95%
+    if overlap_percentage >= 70:
+        logger.debug(f"  [SIMILARITY MATCH {overlap_percentage:.0f}%]")
+        return False, overlap_percentage
+    
+    # Default: not a match
+    logger.debug(f"  [SIMILARITY MISMATCH] Only {overlap_percentage:.0f}% overlap")
+    return False, overlap_percentage
+
+def _name_similarity_matrix(names1, names2):
+    """
+    Compute the full name-similarity matrix between two lists of base names
+    Args:
+        names1: List of base names (rows)
+        names2: List of base names (columns)
+    Returns:
+        matrix: Indexable as matrix[i][j] with scores 0-100
+    """
+    if _rf_process is not None:
+        # One vectorized C call over the whole cross product.  score_cutoff
+        # lets the bit-parallel scorer bail out early on pairs it can prove
+        # are below 60 - the lowest threshold any consumer applies (the
+        # color-only fallback); such pairs score 0 instead
+        return _rf_process.cdist(
+            names1, names2,
+            scorer=_rf_fuzz.token_set_ratio,
+            score_cutoff=60,
+            workers=-1
+        )
+    # Fallback: same scores as before, but computed once and reused by
+    # every pass instead of per pair per pass
+    return [
+        [calculate_name_similarity(n1, n2)[1] for n2 in names2]
+        for n1 in names1
+    ]
+
+
+class RankedProduct(NamedTuple):
+    """One ranked entry: a fixed three-field tuple instead of a dict per
+    product, so ranking long result lists doesn't churn the allocator"""
+    product: dict
+    similarity_score: float
+    matching_keywords: int
+
+
+def rank_products_by_similarity(products, search_query):
+    """
+    Rank products by similarity to search query
+    Args:
+        products: List of products with 'product_name' key
+        search_query: Search query string
+    Returns:
+        list: RankedProduct entries sorted by similarity score (highest first)
+    """
+    search_keywords = frozenset(search_query.lower().split())
+    scale = 100.0 / len(search_keywords) if search_keywords else 0.0
+    ranked = []
+
+    for prod in products:
+        # Intersect the query set directly with the token list: counts how
+        # many search keywords are in the product name without materializing
+        # a set per product
+        matching_keywords = len(
+            search_keywords.intersection(_lower(prod['product_name']).split())
+        )
+        ranked.append(RankedProduct(prod, matching_keywords * scale, matching_keywords))
+
+    # Sort by similarity score (highest first)
+    ranked.sort(key=lambda x: x.similarity_score, reverse=True)
+    return ranked
+
+def display_top_products(amazon_ranked, flipkart_ranked, search_query):
+    """
+    Display top 10 products from each site and allow user to select
+    Args:
+        amazon_ranked: Ranked Amazon products
+        flipkart_ranked: Ranked Flipkart products
+        search_query: Original search query
+    Returns:
+        None
+    """
+    print("\n" + "="*100)
+    print(f"TOP MATCHING PRODUCTS FOR: '{search_query}'")
+    print("="*100)
+    
+    print("\nAMAZON (Top 10):")
+    print("-" * 100)
+    for i, item in enumerate(amazon_ranked[:10], 1):
+        prod = item.product
+        score = item.similarity_score
+        print(f"{i}. [{score:.0f}%] {prod['product_name'][:85]}")
+        print(f"   Price: ₹{prod.get('price', 'N/A')}")
+    
+    print("\nFLIPKART (Top 10):")
+    print("-" * 100)
+    for i, item in enumerate(flipkart_ranked[:10], 1):
+        prod = item.product
+        score = item.similarity_score
+        print(f"{i}. [{score:.0f}%] {prod['product_name'][:85]}")
+        print(f"   Price: ₹{prod.get('price', 'N/A')}")
+    
+    print("\n" + "="*100)
+    print("WARNING - The search is VAGUE - please select matching products:")
+    print("  - Example: 'portronics earphones' matches 5+ different models")
+    print("  - Try: 'portronics conch theta' for specific model")
+    print("="*100 + "\n")
+
+class _ProductTable:
+    """
+    Columnar (structure-of-arrays) view of one side's ranked products
+
+    The matching loops index these parallel lists by integer position, so an
+    inner-loop access is a single list index instead of chained dict lookups
+    on nested product dicts
+    """
+    __slots__ = ('products', 'names', 'details', 'categories', 'bases',
+                 'variant_masks', 'brands_lower', 'colors_norm')
+
+    def __init__(self, ranked):
+        self.products = [item.product for item in ranked]
+        self.names = [prod['product_name'] for prod in self.products]
+        self.details = [_details_cached(name) for name in self.names]
+        self.categories = [_category_cached(name) for name in self.names]
+        self.bases = [details[0] for details in self.details]
+        self.variant_masks = [_variant_mask(_lower(base)) for base in self.bases]
+        # Lowercased/normalized columns cached once so the loops never call
+        # .lower() on the same string twice
+        self.brands_lower = [_lower(details[6]) for details in self.details]
+        self.colors_norm = [
+            details[1].strip().lower() if details[1] else ""
+            for details in self.details
+        ]
+
+    def __len__(self):
+        return len(self.products)
+
+
+def _score_pairs_numba(amazon_table, flipkart_table, name_sims):
+    """
+    Score all candidate pairs with the compiled kernel
+
+    Interns the string columns (brand, category, color, storage, weight) to
+    dense int ids shared across both sides, runs _score_pairs_kernel, and
+    decodes the winner back to the same (best_match, best_score,
+    best_name_similarity, best_spec_match_details) the Python loop returns
+    """
+    def intern_pair(values_a, values_b):
+        ids = {'': 0}
+
+        def encode(values):
+            out = _np.empty(len(values), dtype=_np.int64)
+            for idx, value in enumerate(values):
+                out[idx] = ids.setdefault(value, len(ids))
+            return out
+
+        return encode(values_a), encode(values_b)
+
+    def size_value(size):
+        if not size:
+            return _np.nan
+        try:
+            return float(size)
+        except (ValueError, TypeError):
+            return _np.nan
+
+    def weight_columns(table, unit_intern, str_intern):
+        n = len(table)
+        present = _np.zeros(n, dtype=_np.uint8)
+        parsed = _np.zeros(n, dtype=_np.uint8)
+        units = _np.zeros(n, dtype=_np.int64)
+        values = _np.zeros(n, dtype=_np.int64)  # fixed-point thousandths
+        strings = _np.zeros(n, dtype=_np.int64)
+        for idx, details in enumerate(table.details):
+            weight = details[4]
+            if not weight:
+                continue
+            present[idx] = 1
+            strings[idx] = str_intern.setdefault(weight.lower(), len(str_intern))
+            num, unit = extract_numeric_value(weight)
+            if num is not None:
+                parsed[idx] = 1
+                units[idx] = unit_intern.setdefault(unit, len(unit_intern))
+                values[idx] = num
+        return present, parsed, units, values, strings
+
+    sims = _np.asarray(name_sims, dtype=_np.float32)
+    brand_a, brand_b = intern_pair(
+        amazon_table.brands_lower, flipkart_table.brands_lower)
+    cat_a, cat_b = intern_pair(
+        ['' if c == 'general' else c for c in amazon_table.categories],
+        ['' if c == 'general' else c for c in flipkart_table.categories])
+    storage_a, storage_b = intern_pair(
+        [str(d[2]) if d[2] else '' for d in amazon_table.details],
+        [str(d[2]) if d[2] else '' for d in flipkart_table.details])
+    color_a, color_b = intern_pair(
+        amazon_table.colors_norm, flipkart_table.colors_norm)
+    vmask_a = _np.array(amazon_table.variant_masks, dtype=_np.int64)
+    vmask_b = _np.array(flipkart_table.variant_masks, dtype=_np.int64)
+    vcat_masks = _np.array(list(_VARIANT_CATEGORY_MASKS.values()), dtype=_np.int64)
+    vcat_strict = _np.array(
+        [cat in _STRICT_VARIANT_CATEGORIES for cat in _VARIANT_CATEGORY_MASKS],
+        dtype=_np.uint8)
+    size_a = _np.array([size_value(d[3]) for d in amazon_table.details])
+    size_b = _np.array([size_value(d[3]) for d in flipkart_table.details])
+    unit_intern, str_intern = {}, {}
+    weights_a = weight_columns(amazon_table, unit_intern, str_intern)
+    weights_b = weight_columns(flipkart_table, unit_intern, str_intern)
+
+    best_i, best_j, best_score, bits = _score_pairs_kernel(
+        sims, cat_a, cat_b, brand_a, brand_b,
+        storage_a, storage_b, color_a, color_b,
+        vmask_a, vmask_b, vcat_masks, vcat_strict,
+        size_a, size_b,
+        weights_a[0], weights_b[0], weights_a[1], weights_b[1],
+        weights_a[2], weights_b[2], weights_a[3], weights_b[3],
+        weights_a[4], weights_b[4])
+
+    if best_i < 0:
+        return None, 0, 0, {}
+
+    amazon_prod = amazon_table.products[best_i]
+    flipkart_prod = flipkart_table.products[best_j]
+    similarity = float(sims[best_i, best_j])
+    match_flags = MatchFlag.CATEGORY | MatchFlag.BRAND
+    if bits & 1:
+        match_flags |= MatchFlag.STORAGE
+    if bits & 2:
+        match_flags |= MatchFlag.COLOR
+    if bits & 4:
+        match_flags |= MatchFlag.SIZE
+    if bits & 8:
+        match_flags |= MatchFlag.WEIGHT
+    logger.info(f"\n[BEST MATCH CANDIDATE] Score: {best_score:.1f}")
+    logger.info(f"  Amazon:  {amazon_prod['product_name']}")
+    logger.info(f"  Flipkart: {flipkart_prod['product_name']}")
+    logger.info(f"  Details: {_flags_to_details(match_flags, similarity)}")
+    return (amazon_prod, flipkart_prod), best_score, similarity, match_flags
+
+
+def _score_pairs_python(amazon_table, flipkart_table, name_sims, candidate_indices):
+    """
+    Pure-Python pair scorer with the full per-pair debug trace
+
+    Used when numba is unavailable or debug logging is enabled; returns
+    (best_match, best_score, best_name_similarity, best_flags)
+    """
+    amazon_details = amazon_table.details
+    amazon_categories = amazon_table.categories
+    amazon_variant_masks = amazon_table.variant_masks
+    flipkart_details = flipkart_table.details
+    flipkart_categories = flipkart_table.categories
+    flipkart_variant_masks = flipkart_table.variant_masks
+
+    best_match = None
+    best_score = 0
+    best_name_similarity = 0
+    best_flags = MatchFlag(0)
+
+    # Evaluated once: skips every per-pair f-string format when debug
+    # logging is off (the common case at INFO level)
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    for i in range(len(amazon_table)):
+        amazon_prod = amazon_table.products[i]
+        amazon_base, amazon_color, amazon_storage, amazon_size, amazon_weight, amazon_dims, amazon_brand = amazon_details[i]
+        amazon_category = amazon_categories[i]
+
+        # DEBUG: Log extracted details
+        if debug:
+            logger.debug(f"\nAmazon product analysis:")
+            logger.debug(f"  Name: {amazon_prod['product_name'][:80]}")
+            logger.debug(f"  Extracted - Brand: {amazon_brand}, Color: '{amazon_color}', Storage: {amazon_storage}GB, Category: {amazon_category}")
+
+        # Only visit Flipkart products whose category/brand bucket is
+        # compatible - everything else would fail the first two gates anyway
+        for j in candidate_indices(amazon_category, amazon_table.brands_lower[i]):
+            flipkart_prod = flipkart_table.products[j]
+            flipkart_base, flipkart_color, flipkart_storage, flipkart_size, flipkart_weight, flipkart_dims, flipkart_brand = flipkart_details[j]
+            flipkart_category = flipkart_categories[j]
+
+            # DEBUG: Log extracted details
+            if debug:
+                logger.debug(f"  Flipkart product analysis:")
+                logger.debug(f"    Name: {flipkart_prod['product_name'][:80]}")
+                logger.debug(f"    Extracted - Brand: {flipkart_brand}, Color: '{flipkart_color}', Storage: {flipkart_storage}GB, Category: {flipkart_category}")
+
+            rejection_reason = None
+
+            # ===== STEP 0 + STEP 1: CATEGORY AND BRAND =====
+            # Guaranteed compatible by the bucket join above
+            match_flags = MatchFlag.CATEGORY | MatchFlag.BRAND
+            match_score = 25
+            if debug:
+                logger.debug(f"✓ Brand match: {amazon_brand}")
+
+            # ===== STEP 2: BASE NAME SIMILARITY (must be >= 70%) =====
+            similarity = name_sims[i][j]
+
+            # Accept match if similarity is 70% or higher (lenient for incomplete product names)
+            if similarity < 70:
+                if debug:
+                    rejection_reason = f"Name similarity too low: {similarity:.0f}% (required: 70%)"
+                continue
+            
+            match_score += (similarity / 5)  # Max 20 points
+            if debug:
+                logger.debug(f"✓ Name similarity: {similarity:.0f}%")
+            
+            # ===== STEP 2.5: PRODUCT VARIANT CHECK - Ensure same product variants =====
+            # Masks were precomputed per product, so the common case (identical
+            # variants) is a single integer comparison; the per-category walk
+            # only runs when the masks differ
+            amazon_mask = amazon_variant_masks[i]
+            flipkart_mask = flipkart_variant_masks[j]
+
+            variant_mismatch = False
+            if amazon_mask != flipkart_mask:
+                for category, cat_mask in _VARIANT_CATEGORY_MASKS.items():
+                    amazon_variant = amazon_mask & cat_mask
+                    flipkart_variant = flipkart_mask & cat_mask
+                    if amazon_variant == flipkart_variant:
+                        continue
+
+                    # If both have variants, they must match
+                    if amazon_variant and flipkart_variant:
+                        # Different variants in same category - likely different products
+                        rejection_reason = f"Product variant mismatch ({category}): {_mask_keywords(amazon_variant)} vs {_mask_keywords(flipkart_variant)}"
+                    # If one has a variant and the other doesn't (for key categories), also reject
+                    elif category in _STRICT_VARIANT_CATEGORIES:
+                        rejection_reason = f"Product variant missing ({category}): {_mask_keywords(amazon_variant) if amazon_variant else 'none'} vs {_mask_keywords(flipkart_variant) if flipkart_variant else 'none'}"
+                    else:
+                        continue
+
+                    if debug:
+                        logger.debug(f"  [VARIANT MISMATCH] {rejection_reason}")
+                    variant_mismatch = True
+                    break
+
+            if variant_mismatch:
+                continue
+            
+            # ===== STEP 3: STORAGE - MUST MATCH EXACTLY (IF BOTH HAVE IT) =====
+            # Only enforce storage matching if BOTH products have storage extracted from their names
+            # If only one has storage info in the name, that's OK - products may not include it in the title
+            if amazon_storage and flipkart_storage:
+                # Both have storage extracted - must match exactly
+                if amazon_storage != flipkart_storage:
+                    if debug:
+                        rejection_reason = f"Storage capacity mismatch: {amazon_storage}GB vs {flipkart_storage}GB"
+                    continue
+                
+                match_flags |= MatchFlag.STORAGE
+                match_score += 25  # High priority
+                if debug:
+                    logger.debug(f"✓ Storage match: {amazon_storage}GB")
+            elif debug and (amazon_storage or flipkart_storage):
+                # Only one has storage in the name - this is not a rejection, just note it
+                logger.debug(f"⚠ Only one product has storage in name (A:{amazon_storage}, F:{flipkart_storage})")
+            
+            # ===== STEP 4: COLOR - MUST MATCH EXACTLY (CRITICAL) =====
+            if amazon_color or flipkart_color:
+                # Normalize color comparison
+                amazon_color_norm = amazon_color.strip().lower() if amazon_color else ""
+                flipkart_color_norm = flipkart_color.strip().lower() if flipkart_color else ""
+                
+                # If one has color, both should have color for proper matching
+                if amazon_color_norm and flipkart_color_norm:
+                    # Both have colors - must match exactly
+                    if amazon_color_norm != flipkart_color_norm:
+                        if debug:
+                            rejection_reason = f"Color mismatch: '{amazon_color}' vs '{flipkart_color}'"
+                        continue
+                    match_flags |= MatchFlag.COLOR
+                    match_score += 20  # High priority
+                    if debug:
+                        logger.debug(f"✓ Color match: {amazon_color}")
+                elif amazon_color_norm or flipkart_color_norm:
+                    # Only one has color extracted - this is a mismatch
+                    if debug:
+                        rejection_reason = f"Color availability mismatch: A has '{amazon_color}', F has '{flipkart_color}'"
+                    continue
+            
+            # ===== STEP 5: SIZE - SHOULD MATCH (for cosmetics/packages) =====
+            if amazon_size or flipkart_size:
+                if amazon_size and flipkart_size:
+                    try:
+                        if float(amazon_size) == float(flipkart_size):
+                            match_flags |= MatchFlag.SIZE
+                            match_score += 10
+                            if debug:
+                                logger.debug(f"✓ Size match: {amazon_size}")
+                        elif debug:
+                            logger.debug(f"⚠ Size mismatch: {amazon_size} vs {flipkart_size} (not critical for this match)")
+                    except (ValueError, TypeError):
+                        if debug:
+                            logger.debug(f"⚠ Could not compare sizes: {amazon_size} vs {flipkart_size}")
+            
+            # ===== STEP 6: WEIGHT - SHOULD MATCH (for cosmetics) =====
+            if amazon_weight or flipkart_weight:
+                if amazon_weight and flipkart_weight:
+                    if weights_match(amazon_weight, flipkart_weight):
+                        match_flags |= MatchFlag.WEIGHT
+                        match_score += 10
+                        if debug:
+                            logger.debug(f"✓ Weight match: {amazon_weight}")
+            
+            # ===== EXCELLENT MATCH FOUND =====
+            if match_score > best_score:
+                best_score = match_score
+                best_name_similarity = similarity
+                best_match = (amazon_prod, flipkart_prod)
+                best_flags = match_flags
+
+                logger.info(f"\n[BEST MATCH CANDIDATE] Score: {best_score:.1f}")
+                logger.info(f"  Amazon:  {amazon_prod['product_name']}")
+                logger.info(f"  Flipkart: {flipkart_prod['product_name']}")
+                logger.info(f"  Details: {_flags_to_details(match_flags, similarity)}")
+
+                if best_score >= _MAX_PAIR_SCORE:
+                    # Branch-and-bound cutoff: no remaining pair can beat a
+                    # ceiling-score match, so stop scanning
+                    return best_match, best_score, best_name_similarity, best_flags
+
+    return best_match, best_score, best_name_similarity, best_flags
+
+
+# Memo for find_best_matching_pair, keyed by the product-name tuples and
+# the query. Repeated comparisons over the same listings (tests, repeated
+# searches) skip the whole similarity-matrix pass. LRU with a small cap,
+# same shape as PriceComparator._result_cache below.
+_PAIR_CACHE = OrderedDict()
+_PAIR_CACHE_MAX = 256
+
+
+def find_best_matching_pair(amazon_results, flipkart_results, search_query=None):
+    """
+    Find the best matching product pair by semantic similarity.
+
+    Memoized front end: identical (amazon names, flipkart names, query)
+    calls return the previously computed triple without rebuilding the
+    similarity matrix. See _find_best_matching_pair for the matching
+    criteria.
+
+    Args:
+        amazon_results: List of Amazon products
+        flipkart_results: List of Flipkart products
+        search_query: Original search query (for ranking)
+    Returns:
+        tuple: (amazon_product, flipkart_product, match_quality)
+    """
+    if not amazon_results or not flipkart_results:
+        return None, None, MatchQuality.NO_RESULTS
+
+    cache_key = (
+        tuple(p.get('product_name', '') for p in amazon_results),
+        tuple(p.get('product_name', '') for p in flipkart_results),
+        search_query
+    )
+    cached = _PAIR_CACHE.get(cache_key)
+    if cached is not None:
+        _PAIR_CACHE.move_to_end(cache_key)
+        logger.debug("Match pair cache hit - skipping similarity computation")
+        return cached
+
+    result = _find_best_matching_pair(amazon_results, flipkart_results, search_query)
+    if len(_PAIR_CACHE) >= _PAIR_CACHE_MAX:
+        _PAIR_CACHE.popitem(last=False)
+    _PAIR_CACHE[cache_key] = result
+    return result
+
+
+def _find_best_matching_pair(amazon_results, flipkart_results, search_query=None):
+    """
+    Find the best matching product pair by semantic similarity
+
+    MATCHING CRITERIA (in order of importance):
+    1. Category must match (e.g., phone vs phone)
+    2. Brand must match exactly
+    3. Base model/name must be >= 70% similar
+    4. STORAGE CAPACITY MUST MATCH EXACTLY (if present in both)
+    5. COLOR MUST MATCH EXACTLY (if present in both)
+    6. Size/Weight/Dimensions should match if specified
+    
+    This ensures we compare "iPhone 17 Pro 256GB Cosmic Orange" with 
+    "Apple iPhone 17 Pro (Cosmic Orange, 256GB)" and NOT with 
+    "Apple iPhone 17 Pro (Deep Blue, 256GB)"
+    
+    Args:
+        amazon_results: List of Amazon products
+        flipkart_results: List of Flipkart products
+        search_query: Original search query (for ranking)
+    Returns:
+        tuple: (amazon_product, flipkart_product, match_quality)
+    """
+    if not amazon_results or not flipkart_results:
+        return None, None, MatchQuality.NO_RESULTS
+    
+    # Rank products by similarity to search query
+    if search_query:
+        amazon_ranked = rank_products_by_similarity(amazon_results, search_query)
+        flipkart_ranked = rank_products_by_similarity(flipkart_results, search_query)
+    else:
+        amazon_ranked = [RankedProduct(p, 100, 0) for p in amazon_results]
+        flipkart_ranked = [RankedProduct(p, 100, 0) for p in flipkart_results]
+    
+    best_match = None
+    best_score = 0
+    best_name_similarity = 0
+    best_spec_match_details = {}
+    match_quality = MatchQuality.NO_MATCH
+
+    # Fallback tier candidates, filled during the same sweep as the primary
+    # matcher (first pair found in ranked order wins, as before):
+    #   tier 1: color + storage match on the same model
+    #   tier 2: color match only on the same model
+    best_color_storage_pair = None
+    best_color_only_pair = None
+
+    logger.info(f"\n{'='*70}")
+    logger.info(f"SEMANTIC PRODUCT MATCHING")
+    logger.info(f"{'='*70}")
+    logger.info(f"Matching {len(amazon_results)} Amazon vs {len(flipkart_results)} Flipkart products")
+    logger.info(f"Search Query: {search_query}")
+    logger.info(f"{'='*70}\n")
+
+    # Columnar tables: details, categories, base names and variant masks are
+    # extracted once per product and shared by the main matching pass and
+    # both fallback passes
+    amazon_table = _ProductTable(amazon_ranked)
+    flipkart_table = _ProductTable(flipkart_ranked)
+    amazon_details = amazon_table.details
+    flipkart_details = flipkart_table.details
+    flipkart_categories = flipkart_table.categories
+
+    # Compute all base-name similarities in one vectorized call instead of
+    # re-scoring each pair inside the N*M loop
+    name_sims = _name_similarity_matrix(amazon_table.bases, flipkart_table.bases)
+
+    # Bucket Flipkart products by (category, brand): category and brand are
+    # hard gates that reject most pairs, so a hash join beats probing every
+    # pair in the nested loop
+    flipkart_buckets = defaultdict(list)
+    for j in range(len(flipkart_table)):
+        flipkart_buckets[(flipkart_categories[j], flipkart_table.brands_lower[j])].append(j)
+
+    def candidate_indices(category, brand_lower):
+        """Flipkart indices compatible with an Amazon product's category/brand
+        ('general' is compatible with every category, both directions)"""
+        if category == 'general':
+            return sorted(
+                j
+                for (cat, brand), js in flipkart_buckets.items()
+                if brand == brand_lower
+                for j in js
+            )
+        js = list(flipkart_buckets.get((category, brand_lower), ()))
+        js += flipkart_buckets.get(('general', brand_lower), ())
+        return sorted(js)
+
+    # Fallback tiers ignore brand and category, but they do require a color
+    # match - so index Flipkart products by normalized color and only scan
+    # same-color candidates (ranked order preserved by ascending indices)
+    color_buckets = defaultdict(list)
+    for j, color in enumerate(flipkart_table.colors_norm):
+        if color:
+            color_buckets[color].append(j)
+
+    for i, details in enumerate(amazon_details):
+        if best_color_storage_pair and best_color_only_pair:
+            break
+        amazon_color = amazon_table.colors_norm[i]
+        if not amazon_color:
+            continue
+        amazon_storage = details[2]
+        for j in color_buckets.get(amazon_color, ()):
+            flipkart_storage = flipkart_details[j][2]
+            storage_match = bool(amazon_storage) and amazon_storage == flipkart_storage
+
+            if (best_color_storage_pair is None and storage_match
+                    and name_sims[i][j] >= 70):
+                best_color_storage_pair = (
+                    amazon_table.products[i], flipkart_table.products[j],
+                    details[1], amazon_storage
+                )
+            if best_color_only_pair is None and name_sims[i][j] >= 60:
+                best_color_only_pair = (
+                    amazon_table.products[i], flipkart_table.products[j],
+                    details[1], amazon_storage,
+                    flipkart_details[j][1], flipkart_storage
+                )
+
+    # Score every candidate pair: compiled kernel when numba is available
+    # and the per-pair debug trace is off, pure-Python loop otherwise
+    if _HAS_NUMBA and not logger.isEnabledFor(logging.DEBUG):
+        best_match, best_score, best_name_similarity, best_flags = \
+            _score_pairs_numba(amazon_table, flipkart_table, name_sims)
+    else:
+        best_match, best_score, best_name_similarity, best_flags = \
+            _score_pairs_python(amazon_table, flipkart_table, name_sims, candidate_indices)
+
+    logger.info(f"\n{'='*70}")
+    if best_match:
+        # Determine match quality based on criteria met (popcount of the
+        # quality-relevant flag bits)
+        criteria_met = int(best_flags & _QUALITY_CRITERIA).bit_count()
+
+        if MatchFlag.STORAGE in best_flags and MatchFlag.COLOR in best_flags:
+            match_quality = MatchQuality.PERFECT
+        elif criteria_met >= 3 and best_name_similarity >= 80:
+            match_quality = MatchQuality.EXCELLENT
+        elif criteria_met >= 2 and best_name_similarity >= 70:
+            match_quality = MatchQuality.GOOD
+        elif criteria_met >= 1 and best_name_similarity >= 60:
+            match_quality = MatchQuality.PARTIAL
+        else:
+            match_quality = MatchQuality.WEAK
+        
+        logger.info(f"[FINAL RESULT] Match Quality: {match_quality.upper()} (Score: {best_score:.1f})")
+        logger.info(f"  Amazon:  {best_match[0]['product_name']}")
+        logger.info(f"  Flipkart: {best_match[1]['product_name']}")
+        logger.info(f"{'='*70}\n")
+        
+        if best_name_similarity >= 50:
+            return best_match[0], best_match[1], match_quality
+    
+    # No acceptable match found
+    logger.warning(f"\n{'='*70}")
+    logger.warning(f"NO PERFECT MATCH FOUND")
+    logger.warning(f"Attempting intelligent fallback matching...")
+    logger.warning(f"{'='*70}\n")
+    
+    if search_query:
+        display_top_products(amazon_ranked, flipkart_ranked, search_query)
+    
+    # FALLBACK PRIORITY 1: COLOR + STORAGE match (most important)
+    # Even if brand name extraction differs (iPhone vs Apple), match on these
+    # specs. The candidate was already recorded during the main sweep.
+    if best_color_storage_pair:
+        fb_amazon, fb_flipkart, fb_color, fb_storage = best_color_storage_pair
+        logger.warning(f"\n✓ FALLBACK LEVEL 1: Color + Storage match found!")
+        logger.warning(f"  Color: {fb_color} | Storage: {fb_storage}GB")
+        logger.warning(f"Using FALLBACK LEVEL 1 (color + storage match):")
+        logger.warning(f"  Amazon: {fb_amazon['product_name'][:70]}")
+        logger.warning(f"  Flipkart: {fb_flipkart['product_name'][:70]}\n")
+        return fb_amazon, fb_flipkart, MatchQuality.COLOR_STORAGE
+
+    # SECOND FALLBACK: at least a COLOR match on the same model (base name
+    # >= 60%, brand NOT required to match because brand extraction is
+    # inconsistent between Amazon and Flipkart); also recorded in the sweep
+    if best_color_only_pair:
+        fb_amazon, fb_flipkart, fb_a_color, fb_a_storage, fb_f_color, fb_f_storage = best_color_only_pair
+        logger.warning(f"\n⚠ SECOND LEVEL FALLBACK (Color match found):")
+        logger.warning(f"  Amazon Color: '{fb_a_color}' | Storage: {fb_a_storage}GB")
+        logger.warning(f"  Flipkart Color: '{fb_f_color}' | Storage: {fb_f_storage}GB")
+        logger.warning(f"Using second-level fallback (color match only):")
+        logger.warning(f"  Amazon: {fb_amazon['product_name'][:70]}")
+        logger.warning(f"  Flipkart: {fb_flipkart['product_name'][:70]}")
+        logger.warning(f"⚠️  WARNING: Storage capacity differs - prices may not be comparable\n")
+        return fb_amazon, fb_flipkart, MatchQuality.COLOR_ONLY
+    
+    # Last resort: Return top-ranked products with STRONG warning
+    if amazon_ranked and flipkart_ranked:
+        top_amazon = amazon_table.products[0]
+        top_flipkart = flipkart_table.products[0]
+        a_base, a_color, a_storage, _, _, _, _ = amazon_details[0]
+        f_base, f_color, f_storage, _, _, _, _ = flipkart_details[0]
+        
+        logger.warning(f"\n⛔ LAST RESORT FALLBACK - NO ACCEPTABLE MATCH FOUND:")
+        logger.warning(f"  Amazon: {top_amazon['product_name'][:70]}")
+        logger.warning(f"    Color: '{a_color}' | Storage: {a_storage}GB")
+        logger.warning(f"  Flipkart: {top_flipkart['product_name'][:70]}")
+        logger.warning(f"    Color: '{f_color}' | Storage: {f_storage}GB")
+        logger.warning(f"\n⛔ CRITICAL WARNING:")
+        logger.warning(f"   - Colors DO NOT MATCH ({a_color} vs {f_color})")
+        logger.warning(f"   - Storage capacity may differ ({a_storage}GB vs {f_storage}GB)")
+        logger.warning(f"   - This comparison may not be valid!")
+        logger.warning(f"   - Please try a more specific search query\n")
+        return top_amazon, top_flipkart, MatchQuality.LAST_RESORT
+    
+    return None, None, MatchQuality.NO_MATCH
+
+
+@lru_cache(maxsize=1024)
+def _compare_products_cached(a_price, a_rating, a_reviews, f_price, f_rating, f_reviews):
+    """compare_products memoized on the scalar fields it actually reads"""
+    return compare_products(
+        {'price': a_price, 'rating': a_rating, 'review_count': a_reviews},
+        {'price': f_price, 'rating': f_rating, 'review_count': f_reviews}
+    )
+
+
+class PriceComparator:
+    """Main application class for price comparison"""
+    
+    def __init__(self):
+        """Initialize the application"""
+        self.db = Database()
+        self.amazon_scraper = AmazonScraper()
+        self.flipkart_scraper = FlipkartScraper()
+        self.excel_reporter = ExcelReporter()
+        # Session-level result cache keyed by normalized query: a repeat
+        # search costs a dict hit instead of the scrape+match pipeline
+        self._result_cache = OrderedDict()
+        self._result_cache_max = 256
+        logger.info("Price Comparator initialized")
+    
+    def search_and_compare(self, product_name):
+        """
+        Search for product in database or scrape if not found
+        Args:
+            product_name: Product to search
+        Returns:
+            dict: Comparison results
+        """
+        logger.info(f"Starting search for: {product_name}")
+
+        # Fast path: exact repeat of an earlier query this session
+        cache_key = product_name.strip().lower()
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Result cache hit, skipping scrape")
+            self._result_cache.move_to_end(cache_key)
+            result = deepcopy(cached)
+            result['from_database'] = True
+            return result
+
+        # Search in database
+        db_result = self.db.search_product(product_name)
+        
+        amazon_data = None
+        flipkart_data = None
+        from_database = True
+        
+        # Check if both products are in database
+        if db_result and db_result['amazon'] and db_result['flipkart']:
+            logger.info("Products found in database")
+            amazon_data = db_result['amazon']
+            flipkart_data = db_result['flipkart']
+        else:
+            # Need to scrape
+            logger.info("Products not in database, scraping...")
+            from_database = False
+            
+            # Scrape both platforms concurrently: the searches are
+            # independent network-bound fetches, so Flipkart scraping
+            # overlaps Amazon scraping and filtering
+            def scrape_and_filter(scraper):
+                raw = scraper.search(product_name)
+                results = filter_products(product_name, raw, similarity_threshold=0.65)
+                # Warm the per-name caches while the other platform is still
+                # scraping, so the matching stage finds them hot and its
+                # regex work is hidden behind network latency
+                for prod in results:
+                    name = prod['product_name']
+                    _variant_mask(_lower(_details_cached(name)[0]))
+                    _category_cached(name)
+                return results
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                amazon_future = executor.submit(scrape_and_filter, self.amazon_scraper)
+                flipkart_future = executor.submit(scrape_and_filter, self.flipkart_scraper)
+                amazon_results = amazon_future.result()
+                flipkart_results = flipkart_future.result()
+            
+            logger.info(f"Amazon returned {len(amazon_results)} results")
+            for i, p in enumerate(amazon_results[:3]):
+                logger.info(f"  Amazon {i+1}: {p['product_name'][:70]}")
+            
+            logger.info(f"Flipkart returned {len(flipkart_results)} results")
+            for i, p in enumerate(flipkart_results[:3]):
+                logger.info(f"  Flipkart {i+1}: {p['product_name'][:70]}")
+            
+            if amazon_results and flipkart_results:
+                # Find best matching pair by size, color, and other attributes
+                amazon_product, flipkart_product, match_quality = find_best_matching_pair(amazon_results, flipkart_results, product_name)
+                
+                # Store in database
+                if amazon_product:
+                    self.db.insert_amazon_product(
+                        amazon_product['product_name'],
+                        amazon_product['price'],
+                        amazon_product['rating'],
+                        amazon_product['review_count'],
+                        amazon_product['url'],
+                        amazon_product['description']
+                    )
+                    amazon_data = amazon_product
+                
+                if flipkart_product:
+                    self.db.insert_flipkart_product(
+                        flipkart_product['product_name'],
+                        flipkart_product['price'],
+                        flipkart_product['rating'],
+                        flipkart_product['review_count'],
+                        flipkart_product['url'],
+                        flipkart_product['description']
+                    )
+                    flipkart_data = flipkart_product
+            elif amazon_results:
+                # Only Amazon has results
+                amazon_product = amazon_results[0]
+                self.db.insert_amazon_product(
+                    amazon_product['product_name'],
+                    amazon_product['price'],
+                    amazon_product['rating'],
+                    amazon_product['review_count'],
+                    amazon_product['url'],
+                    amazon_product['description']
+                )
+                amazon_data = amazon_product
+                logger.warning("Only Amazon products found, comparison limited to one platform")
+            elif flipkart_results:
+                # Only Flipkart has results
+                flipkart_product = flipkart_results[0]
+                self.db.insert_flipkart_product(
+                    flipkart_product['product_name'],
+                    flipkart_product['price'],
+                    flipkart_product['rating'],
+                    flipkart_product['review_count'],
+                    flipkart_product['url'],
+                    flipkart_product['description']
+                )
+                flipkart_data = flipkart_product
+                logger.warning("Only Flipkart products found, comparison limited to one platform")
+        
+        # Compare products
+        if amazon_data and flipkart_data:
+            # Cached entries are shared, so hand callers their own copy
+            comparison = deepcopy(_compare_products_cached(
+                amazon_data['price'], amazon_data['rating'], amazon_data['review_count'],
+                flipkart_data['price'], flipkart_data['rating'], flipkart_data['review_count']
+            ))
+            
+            # Add to Excel
+            self.excel_reporter.add_product_comparison(
+                {'amazon': amazon_data, 'flipkart': flipkart_data},
+                comparison
+            )
+            
+            result = {
+                'status': 'success',
+                'from_database': from_database,
+                'amazon': amazon_data,
+                'flipkart': flipkart_data,
+                'comparison': comparison
+            }
+        elif amazon_data or flipkart_data:
+            # Only one platform has data - return partial results
+            result = {
+                'status': 'partial',
+                'message': 'Found on only one platform',
+                'from_database': from_database,
+                'amazon': amazon_data,
+                'flipkart': flipkart_data,
+                'comparison': None
+            }
+        else:
+            result = {
+                'status': 'error',
+                'message': 'Could not find products on both platforms',
+                'amazon': amazon_data,
+                'flipkart': flipkart_data
+            }
+
+        # Cache successful lookups for repeat queries (LRU-capped)
+        if result['status'] == 'success':
+            if len(self._result_cache) >= self._result_cache_max:
+                self._result_cache.popitem(last=False)
+            self._result_cache[cache_key] = deepcopy(result)
+
+        return result
+    
+    def display_comparison(self, result):
+        """
+        Display comparison results to user
+        Args:
+            result: Comparison result dictionary
+        """
+        # Accumulate the report and emit it with one stdout write instead
+        # of a lock + syscall per print
+        lines = ["", "="*80]
+
+        status = result.get('status')
+
+        if status == 'error':
+            lines.append(f"Error: {result.get('message', 'Unknown error')}")
+            sys.stdout.write('\n'.join(lines) + '\n')
+            return
+
+        if status == 'partial':
+            lines.append("WARNING: Product found on only one platform")
+            lines.append(f"Message: {result.get('message', '')}")
+            lines.append("="*80)
+        else:
+            lines.append("PRODUCT COMPARISON RESULTS")
+            lines.append(f"Source: {'Database' if result['from_database'] else 'Web Scraping'}")
+            lines.append("="*80)
+
+        amazon = result.get('amazon', {})
+        flipkart = result.get('flipkart', {})
+        comparison = result.get('comparison', {})
+
+        # Amazon Details
+        if amazon:
+            lines.append(f"\nAMAZON:")
+            lines.append(f"  Product:      {amazon.get('product_name', 'N/A')}")
+            lines.append(f"  Price:        {amazon.get('price', 'N/A')}")
+            lines.append(f"  Rating:       {amazon.get('rating', 'N/A')} stars")
+            lines.append(f"  Reviews:      {amazon.get('review_count', 0)}")
+            lines.append(f"  URL:          {amazon.get('url', 'N/A')}")
+        else:
+            lines.append("\nAMAZON: Not found")
+
+        # Flipkart Details
+        if flipkart:
+            lines.append(f"\nFLIPKART:")
+            lines.append(f"  Product:      {flipkart.get('product_name', 'N/A')}")
+            lines.append(f"  Price:        {flipkart.get('price', 'N/A')}")
+            lines.append(f"  Rating:       {flipkart.get('rating', 'N/A')} stars")
+            lines.append(f"  Reviews:      {flipkart.get('review_count', 0)}")
+            lines.append(f"  URL:          {flipkart.get('url', 'N/A')}")
+        else:
+            lines.append(f"\nFLIPKART: Not found")
+
+        # Comparison (only if both products exist)
+        if comparison and amazon and flipkart:
+            lines.append(f"\nCOMPARISON & RECOMMENDATION:")
+            lines.append(f"  Cheaper Deal: {comparison.get('cheaper_platform', 'N/A')}")
+            lines.append(f"  Cheaper By:   {comparison.get('cheaper_by_percentage', 0)}%")
+            lines.append(f"  Better Rating:{comparison.get('better_rating_platform', 'N/A')}")
+            lines.append(f"  More Reviews: {comparison.get('better_reviews_platform', 'N/A')}")
+            lines.append(f"\n  RECOMMENDATION: Buy from {comparison.get('recommendation', 'N/A')}")
+
+        lines.append("\n" + "="*80)
+        if amazon and flipkart:
+            lines.append(f"Excel report updated: {self.excel_reporter.get_file_path()}")
+        lines.append("="*80 + "\n")
+        sys.stdout.write('\n'.join(lines) + '\n')
+    
+    def show_all_products(self):
+        """Display all products in database"""
+        products = self.db.get_all_products()
+        
+        if not products:
+            print("No products in database")
+            return
+        
+        # Build the whole listing and write it in one call
+        lines = ["", "="*80, "ALL PRODUCTS IN DATABASE", "="*80]
+
+        lines.append(f"\nAMAZON PRODUCTS ({len(products['amazon'])} items):")
+        lines.extend(f"{idx}. {product['product_name']} - ₹{product['price']}"
+                     for idx, product in enumerate(products['amazon'], 1))
+
+        lines.append(f"\nFLIPKART PRODUCTS ({len(products['flipkart'])} items):")
+        lines.extend(f"{idx}. {product['product_name']} - ₹{product['price']}"
+                     for idx, product in enumerate(products['flipkart'], 1))
+
+        lines.append("="*80 + "\n")
+        sys.stdout.write('\n'.join(lines) + '\n')
+    
+    def clear_database(self):
+        """Clear all data from database"""
+        self.db.clear_table('amazon_products')
+        self.db.clear_table('flipkart_products')
+        logger.info("Database cleared")
+        print("Database cleared successfully!")
+
+def main():
+    """Main function to run the application"""
+    print("\n" + "="*80)
+    print("PRICE COMPARISON SYSTEM - AMAZON vs FLIPKART")
+    print("="*80 + "\n")
+    
+    comparator = PriceComparator()
+    
+    while True:
+        print("\nMENU:")
+        print("1. Search & Compare Product")
+        print("2. View All Products in Database")
+        print("3. Clear Database")
+        print("4. Exit")
+        
+        choice = input("\nEnter your choice (1-4): ").strip()
+        
+        if choice == '1':
+            product = input("\nEnter product name to search: ").strip()
+            if product:
+                result = comparator.search_and_compare(product)
+                comparator.display_comparison(result)
+            else:
+                print("Please enter a valid product name!")
+        
+        elif choice == '2':
+            comparator.show_all_products()
+        
+        elif choice == '3':
+            confirm = input("Are you sure? This will delete all data. (yes/no): ").strip().lower()
+            if confirm == 'yes':
+                comparator.clear_database()
+        
+        elif choice == '4':
+            print("\nThank you for using Price Comparison System!")
+            break
+        
+        else:
+            print("Invalid choice! Please try again.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+ONNX Runtime SBERT encoder for faster CPU inference
+
+Exports the sentence-transformers model to ONNX with int8 dynamic
+quantization (2-4x faster encoding, ~4x smaller file) and wraps it in an
+encode() helper compatible with SentenceTransformer.encode. The pipeline
+falls back to the PyTorch model when the export or the ORT stack is
+missing.
+
+Run `python onnx_encoder.py` once to export and quantize the model.
+"""
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _import_ort():
+    """Import the ORT stack on demand - it is heavy and optional"""
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        return ORTModelForFeatureExtraction, AutoTokenizer
+    except ImportError:
+        return None
+
+# Quantized export location; the fp32 export lives alongside it
+ONNX_MODEL_DIR = "./models/onnx-minilm-int8"
+_ONNX_FP32_DIR = "./models/onnx-minilm"
+_BASE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+_FINETUNED_DIR = "./models/finetuned_sbert"
+
+
+class OnnxEncoder:
+    """SentenceTransformer-compatible encode() backed by ONNX Runtime"""
+
+    def __init__(self, model_dir=ONNX_MODEL_DIR):
+        ort_model_cls, tokenizer_cls = _import_ort()
+        self.model = ort_model_cls.from_pretrained(model_dir)
+        self.tokenizer = tokenizer_cls.from_pretrained(model_dir)
+
+    def encode(self, sentences, batch_size=64, convert_to_numpy=True,
+               normalize_embeddings=False, show_progress_bar=False):
+        """
+        Encode one sentence or a list of sentences
+        Mean-pools token embeddings over the attention mask and optionally
+        L2-normalizes, matching SentenceTransformer semantics
+        """
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        # Smart batching: encode in length order so each batch pads to a
+        # near-uniform length instead of the global maximum, then scatter
+        # the rows back (SentenceTransformer does the same internally)
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        sorted_sentences = [sentences[i] for i in order]
+
+        embeddings = []
+        for start in range(0, len(sorted_sentences), batch_size):
+            batch = sorted_sentences[start:start + batch_size]
+            inputs = self.tokenizer(batch, padding=True, truncation=True,
+                                    max_length=256, return_tensors="np")
+            token_embeddings = self.model(**inputs).last_hidden_state
+            mask = inputs['attention_mask'][:, :, None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            embeddings.append(pooled)
+
+        embeddings = np.concatenate(embeddings, axis=0)
+        unsorted = np.empty_like(embeddings)
+        unsorted[order] = embeddings
+        embeddings = unsorted
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-9, None)
+        return embeddings[0] if single else embeddings
+
+
+def load_onnx_encoder(model_dir=ONNX_MODEL_DIR):
+    """Return an OnnxEncoder, or None when ORT or the export is missing"""
+    if not os.path.exists(model_dir) or _import_ort() is None:
+        return None
+    try:
+        return OnnxEncoder(model_dir)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load ONNX encoder: {e}")
+        return None
+
+
+def export_model(source=None):
+    """Export the SBERT model to ONNX and quantize it to int8"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    ORTModelForFeatureExtraction, AutoTokenizer = _import_ort()
+
+    if source is None:
+        source = _FINETUNED_DIR if os.path.exists(_FINETUNED_DIR) else _BASE_MODEL
+    logger.info(f"Exporting {source} to ONNX...")
+
+    model = ORTModelForFeatureExtraction.from_pretrained(source, export=True)
+    model.save_pretrained(_ONNX_FP32_DIR)
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    tokenizer.save_pretrained(_ONNX_FP32_DIR)
+    tokenizer.save_pretrained(ONNX_MODEL_DIR)
+
+    os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+    quantize_dynamic(
+        os.path.join(_ONNX_FP32_DIR, "model.onnx"),
+        os.path.join(ONNX_MODEL_DIR, "model.onnx"),
+        weight_type=QuantType.QInt8
+    )
+    # Config travels with the quantized graph so from_pretrained works
+    model.config.save_pretrained(ONNX_MODEL_DIR)
+    logger.info(f"✓ Quantized ONNX model saved to {ONNX_MODEL_DIR}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if _import_ort() is None:
+        raise SystemExit("optimum[onnxruntime] and transformers are required for export")
+    export_model()
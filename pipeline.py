@@ -6,18 +6,42 @@ User Input → Normalize → Scrape → Embed → Score → Filter → Compare 
 import logging
 import os
 import json
+import pickle
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import numpy as np
 from database import Database
 from amazon_scraper import AmazonScraper
 from flipkart_scraper import FlipkartScraper
 from product_matcher import filter_products
 from utils import setup_logging, compare_products
-from sentence_transformers import SentenceTransformer
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Embedding cache: a dict hit costs microseconds vs milliseconds for a
+# transformer forward pass, so repeat queries and recurring catalog names
+# skip encoding entirely.  Persisted under ./models between runs ('i8'
+# marks the int8-quantized format so stale fp32 caches are not loaded).
+_EMBED_CACHE_FILE = "./models/embed_cache_i8.pkl"
+_EMBED_CACHE_MAX_ENTRIES = 10000
+
+# Normalized embedding components lie in [-1, 1], so int8 with a shared
+# scale of 127 preserves cosine ranking within ~1% at a quarter of the
+# fp32 memory footprint
+_QUANT_SCALE = 127
+
+# Strips currency symbols/commas from scraped prices in one C-level scan
+# instead of a per-character Python filter
+_NON_DIGIT = re.compile(r'[^\d]')
+
+
+def _quantize(embeddings):
+    """Quantize normalized fp32 embeddings to int8 with a shared scale"""
+    return np.round(np.asarray(embeddings) * _QUANT_SCALE).astype(np.int8)
+
 class PriceComparisonPipeline:
     """Complete pipeline for price comparison"""
     
@@ -27,17 +51,64 @@ class PriceComparisonPipeline:
         self.amazon = AmazonScraper()
         self.flipkart = FlipkartScraper()
         
-        # Load fine-tuned SBERT model
-        model_path = "./models/finetuned_sbert"
-        if os.path.exists(model_path):
-            logger.info("✓ Loading fine-tuned SBERT model...")
-            self.model = SentenceTransformer(model_path)
-            logger.info(f"✓ Fine-tuned model loaded from {model_path}")
-        else:
-            logger.warning(f"⚠️ Fine-tuned model not found at {model_path}")
-            logger.info("✓ Loading base SBERT model...")
-            self.model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-    
+        # SBERT load takes seconds, so defer it until a stage actually
+        # encodes something - non-search paths never pay for it
+        self._model = None
+
+        # Cache of embeddings keyed by normalized text, warmed from disk
+        self._embed_cache = {}
+        self._load_embed_cache()
+
+    @property
+    def model(self):
+        """Lazily loaded SBERT encoder (ONNX int8 if exported)"""
+        if self._model is None:
+            self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        """Load the best available encoder on first use"""
+        # Share product_matcher's module-level handle: it already prefers
+        # the int8 ONNX export, then the fine-tuned checkpoint, then the
+        # base model, and loading it twice would double both startup cost
+        # and resident weights
+        from product_matcher import get_model
+        return get_model()
+
+    def _load_embed_cache(self):
+        """Load the persisted embedding cache, if one exists"""
+        try:
+            with open(_EMBED_CACHE_FILE, 'rb') as f:
+                self._embed_cache = pickle.load(f)
+            logger.info(f"✓ Loaded {len(self._embed_cache)} cached embeddings")
+        except (OSError, pickle.PickleError, EOFError):
+            self._embed_cache = {}
+
+    def _save_embed_cache(self):
+        """Persist the embedding cache so later runs warm up instantly"""
+        try:
+            os.makedirs(os.path.dirname(_EMBED_CACHE_FILE), exist_ok=True)
+            with open(_EMBED_CACHE_FILE, 'wb') as f:
+                pickle.dump(self._embed_cache, f)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not persist embedding cache: {e}")
+
+    def _encode_cached(self, text):
+        """
+        self.model.encode with a dict cache keyed by normalized text
+        - Hit: returns the stored embedding without touching the model
+        - Miss: encodes, stores (FIFO-capped), and returns
+        """
+        key = text.strip().lower()
+        embedding = self._embed_cache.get(key)
+        if embedding is None:
+            embedding = _quantize(self.model.encode(text, normalize_embeddings=True))
+            if len(self._embed_cache) >= _EMBED_CACHE_MAX_ENTRIES:
+                # FIFO eviction: dicts iterate in insertion order
+                self._embed_cache.pop(next(iter(self._embed_cache)))
+            self._embed_cache[key] = embedding
+        return embedding
+
     def normalize_input(self, user_input):
         """
         Step 1: Normalize user input
@@ -65,24 +136,35 @@ class PriceComparisonPipeline:
         logger.info(f"{'='*80}")
         logger.info(f"Query: {query}\n")
         
-        # Scrape Amazon
-        logger.info("🔍 Scraping Amazon...")
-        amazon_products = []
-        try:
-            amazon_products = self.amazon.search(query)
-            logger.info(f"✓ Found {len(amazon_products)} products on Amazon\n")
-        except Exception as e:
-            logger.warning(f"⚠️ Amazon scraping failed: {e}\n")
-        
-        # Scrape Flipkart
-        logger.info("🔍 Scraping Flipkart...")
-        flipkart_products = []
-        try:
-            flipkart_products = self.flipkart.search(query)
-            logger.info(f"✓ Found {len(flipkart_products)} products on Flipkart\n")
-        except Exception as e:
-            logger.warning(f"⚠️ Flipkart scraping failed: {e}\n")
-        
+        # Scrape both platforms concurrently - each search is I/O-bound
+        # network time, so wall time is max(A, F) instead of A + F
+        logger.info("🔍 Scraping Amazon and Flipkart in parallel...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            amazon_future = executor.submit(self.amazon.search, query)
+            flipkart_future = executor.submit(self.flipkart.search, query)
+
+            amazon_products = []
+            try:
+                amazon_products = amazon_future.result()
+                logger.info(f"✓ Found {len(amazon_products)} products on Amazon")
+            except Exception as e:
+                logger.warning(f"⚠️ Amazon scraping failed: {e}")
+
+            flipkart_products = []
+            try:
+                flipkart_products = flipkart_future.result()
+                logger.info(f"✓ Found {len(flipkart_products)} products on Flipkart\n")
+            except Exception as e:
+                logger.warning(f"⚠️ Flipkart scraping failed: {e}\n")
+
+        # Canonicalize the name key at the scrape boundary so downstream
+        # stages read product_name directly instead of re-running the
+        # product_name/title/name fallback chain per stage
+        for product in amazon_products:
+            product['product_name'] = product.get('product_name') or product.get('title') or product.get('name') or 'Unknown'
+        for product in flipkart_products:
+            product['product_name'] = product.get('product_name') or product.get('title') or product.get('name') or 'Unknown'
+
         all_products = {
             'amazon': amazon_products,
             'flipkart': flipkart_products,
@@ -102,17 +184,47 @@ class PriceComparisonPipeline:
         logger.info("STEP 3: GENERATE EMBEDDINGS (SBERT)")
         logger.info(f"{'='*80}\n")
         
-        # Add embeddings to products
+        # Resolve cache hits first, then encode all remaining names in one
+        # batched call - fuses the matmuls and amortizes tokenization
+        # instead of paying a forward pass per product
+        pending = []        # (product, cache key) for every cache miss
+        pending_names = []
         for platform in ['amazon', 'flipkart']:
             for product in products[platform]:
-                try:
-                    # Generate embedding for product name/title
-                    product_name = product.get('product_name') or product.get('title') or product.get('name') or 'Unknown'
-                    embedding = self.model.encode(product_name)
-                    product['embedding'] = embedding.tolist()
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to generate embedding: {e}")
+                product_name = product.get('product_name', 'Unknown')
+                key = product_name.strip().lower()
+                # Signature for the filter stage: lowercase once and hash
+                # the tokens so later variant checks are set lookups, not
+                # repeated substring scans
+                product['_name_lower'] = product_name.lower()
+                product['_tokens'] = frozenset(product['_name_lower'].split())
+                cached = self._embed_cache.get(key)
+                if cached is not None:
+                    product['embedding'] = cached
+                else:
+                    pending.append((product, key))
+                    pending_names.append(product_name)
+
+        if pending_names:
+            try:
+                embeddings = _quantize(self.model.encode(
+                    pending_names,
+                    batch_size=64,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                ))
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to generate embeddings: {e}")
+                for product, _ in pending:
                     product['embedding'] = None
+            else:
+                # Scatter the ndarray rows back (no .tolist() reboxing)
+                for (product, key), embedding in zip(pending, embeddings):
+                    product['embedding'] = embedding
+                    if len(self._embed_cache) >= _EMBED_CACHE_MAX_ENTRIES:
+                        self._embed_cache.pop(next(iter(self._embed_cache)))
+                    self._embed_cache[key] = embedding
         
         logger.info(f"✓ Generated embeddings for {products['total']} products\n")
         return products
@@ -126,19 +238,29 @@ class PriceComparisonPipeline:
         logger.info("STEP 4: SIMILARITY SCORING")
         logger.info(f"{'='*80}\n")
         
-        # Generate query embedding
-        query_embedding = self.model.encode(query)
+        # Generate query embedding (cache hit for repeat searches)
+        query_embedding = self._encode_cached(query)
         
-        # Score all products
+        # Score all products: embeddings are L2-normalized at encode time,
+        # so cosine similarity is one matrix-vector product per platform
+        # instead of a scipy cosine call per product
         for platform in ['amazon', 'flipkart']:
+            scored = []
             for product in products[platform]:
-                if product.get('embedding'):
-                    # Compute cosine similarity
-                    from scipy.spatial.distance import cosine
-                    similarity = 1 - cosine(query_embedding, product['embedding'])
-                    product['similarity'] = float(similarity)
+                if product.get('embedding') is not None:
+                    scored.append(product)
                 else:
                     product['similarity'] = 0.0
+            if not scored:
+                continue
+            embeddings = np.stack([p['embedding'] for p in scored])
+            # int8 rows widened to int32 for the MACs, then rescaled back
+            # to the [-1, 1] cosine range the thresholds expect
+            similarities = (
+                embeddings.astype(np.int32) @ query_embedding.astype(np.int32)
+            ) / (_QUANT_SCALE * _QUANT_SCALE)
+            for product, similarity in zip(scored, similarities):
+                product['similarity'] = float(similarity)
         
         logger.info(f"✓ Similarity scores computed\n")
         return products
@@ -156,33 +278,31 @@ class PriceComparisonPipeline:
         
         filtered = {'amazon': [], 'flipkart': []}
         
-        # Check if user asked for specific variants
+        # Check if user asked for specific variants (token-set test, so
+        # 'Protector' no longer counts as a Pro variant)
         query_lower = query.lower()
-        user_wants_pro = "pro" in query_lower or "max" in query_lower or "plus" in query_lower
+        variant_tokens = frozenset({'pro', 'max', 'plus'})
+        user_wants_pro = bool(variant_tokens & set(query_lower.split()))
         
+        pro_tokens = frozenset({'pro', 'max'})
         for platform in ['amazon', 'flipkart']:
             original_count = len(products[platform])
             # Sort by similarity and filter
             products[platform].sort(key=lambda x: x.get('similarity', 0), reverse=True)
-            
-            filtered_products = []
-            for p in products[platform]:
-                product_name_lower = (p.get('product_name') or p.get('title') or p.get('name') or 'Unknown').lower()
-                similarity = p.get('similarity', 0)
-                
-                # Apply stricter threshold for variants user didn't ask for
-                if not user_wants_pro and ("pro" in product_name_lower or "max" in product_name_lower):
-                    # Require higher similarity for Pro models when user searched for base model
-                    if similarity < threshold + 0.15:  # Higher threshold for unwanted variants
-                        logger.debug(f"Excluding {product_name_lower[:60]} (Pro variant not requested, low similarity)")
-                        continue
-                
-                # Check standard threshold
-                if similarity < threshold:
-                    continue
-                
-                filtered_products.append(p)
-            
+
+            plist = products[platform]
+            if plist:
+                # Both thresholds as one branchless boolean expression over
+                # the whole platform instead of a Python branch per product:
+                # keep when above the base threshold, and above the stricter
+                # one for Pro/Max variants the user did not ask for
+                sims = np.array([p.get('similarity', 0) for p in plist])
+                variants = np.array([bool(pro_tokens & p.get('_tokens', frozenset())) for p in plist])
+                mask = (sims >= threshold) & (~variants | user_wants_pro | (sims >= threshold + 0.15))
+                filtered_products = [plist[i] for i in np.nonzero(mask)[0]]
+            else:
+                filtered_products = []
+
             filtered[platform] = filtered_products
             
             logger.info(f"{platform.upper()}:")
@@ -191,13 +311,13 @@ class PriceComparisonPipeline:
             
             # Show top matches
             for i, product in enumerate(filtered[platform][:3], 1):
-                product_name = product.get('product_name') or product.get('title') or product.get('name') or 'Unknown'
+                product_name = product.get('product_name', 'Unknown')
                 logger.info(f"    {i}. {product_name[:80]}... (similarity: {product['similarity']:.3f})")
         
         logger.info('')
         return filtered
     
-    def compare_prices(self, filtered_products):
+    def compare_prices(self, filtered_products, query):
         """
         Step 6: Compare prices & details, store in database
         - Extract price, rating, availability
@@ -206,24 +326,31 @@ class PriceComparisonPipeline:
         logger.info(f"{'='*80}")
         logger.info("STEP 6: COMPARE PRICES & STORE IN DATABASE")
         logger.info(f"{'='*80}\n")
-        
+
         results = {'amazon': [], 'flipkart': []}
         comparison_data = []
-        
+        db_rows = []
+        timestamp = datetime.now().isoformat()
+
+        rows_append = db_rows.append
+        data_append = comparison_data.append
         for platform in ['amazon', 'flipkart']:
+            # Bind per-iteration attribute chains to locals for the hot loop
+            platform_append = results[platform].append
             for product in filtered_products[platform]:
                 try:
                     # Extract price
                     price = product.get('price', 'N/A')
                     if isinstance(price, str):
-                        price_num = float(''.join(filter(str.isdigit, price.split('.')[0])) or 0) / 100
+                        digits = _NON_DIGIT.sub('', price.split('.', 1)[0])
+                        price_num = (int(digits) if digits else 0) / 100
                     else:
                         price_num = price
                     
                     # Create result entry
                     result = {
                         'platform': platform,
-                        'name': product.get('product_name') or product.get('title') or product.get('name', 'Unknown'),
+                        'name': product.get('product_name', 'Unknown'),
                         'price': price,
                         'price_numeric': price_num,
                         'url': product.get('url', 'N/A'),
@@ -232,27 +359,25 @@ class PriceComparisonPipeline:
                         'similarity': product.get('similarity', 0)
                     }
                     
-                    results[platform].append(result)
-                    comparison_data.append(result)
-                    
-                    # Store in database
-                    try:
-                        self.db.insert_comparison({
-                            'timestamp': datetime.now().isoformat(),
-                            'query': query,
-                            'platform': platform,
-                            'product_name': result['name'],
-                            'price': str(result['price']),
-                            'url': result['url'],
-                            'rating': str(result['rating']),
-                            'similarity_score': result['similarity']
-                        })
-                    except Exception as db_err:
-                        logger.warning(f"⚠️ Database store failed: {db_err}")
-                    
+                    platform_append(result)
+                    data_append(result)
+                    rows_append({
+                        'timestamp': timestamp,
+                        'query': query,
+                        'platform': platform,
+                        'product_name': result['name'],
+                        'price': str(result['price']),
+                        'url': result['url'],
+                        'rating': str(result['rating']),
+                        'similarity_score': result['similarity']
+                    })
+
                 except Exception as e:
                     logger.warning(f"⚠️ Failed to process {platform} product: {e}")
-        
+
+        # One executemany transaction instead of a commit per product
+        self.db.insert_comparisons(db_rows)
+
         logger.info(f"✓ Stored {len(comparison_data)} products in database\n")
         
         # Display comparison
@@ -307,8 +432,11 @@ class PriceComparisonPipeline:
             filtered = self.filter_best_matches(products, normalized_query, threshold=threshold)
             
             # Step 6: Compare prices & store
-            results = self.compare_prices(filtered)
-            
+            results = self.compare_prices(filtered, normalized_query)
+
+            # Keep the embedding cache warm for the next process run
+            self._save_embed_cache()
+
             logger.info(f"{'='*80}")
             logger.info("PIPELINE COMPLETE ✓")
             logger.info(f"{'='*80}\n")
@@ -47,7 +47,10 @@ def populate_database():
     """Populate database with sample data"""
     conn = sqlite3.connect('products.db')
     cursor = conn.cursor()
-    
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+
     timestamp = datetime.now().isoformat()
     
     # Create tables
@@ -79,28 +82,19 @@ def populate_database():
         )
     """)
     
-    # Insert Amazon products
+    # Insert all products in one transaction; INSERT OR IGNORE skips duplicate URLs
     logger.info("Inserting Amazon products...")
-    for name, price, rating, count, url, desc in AMAZON_PRODUCTS:
-        try:
-            cursor.execute("""
-                INSERT INTO amazon (product_name, price, rating, review_count, url, description, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (name, price, rating, count, url, desc, timestamp))
-        except sqlite3.IntegrityError:
-            logger.debug(f"Duplicate URL: {url}")
-    
-    # Insert Flipkart products
+    cursor.executemany("""
+        INSERT OR IGNORE INTO amazon (product_name, price, rating, review_count, url, description, last_updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [(*row, timestamp) for row in AMAZON_PRODUCTS])
+
     logger.info("Inserting Flipkart products...")
-    for name, price, rating, count, url, desc in FLIPKART_PRODUCTS:
-        try:
-            cursor.execute("""
-                INSERT INTO flipkart (product_name, price, rating, review_count, url, description, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (name, price, rating, count, url, desc, timestamp))
-        except sqlite3.IntegrityError:
-            logger.debug(f"Duplicate URL: {url}")
-    
+    cursor.executemany("""
+        INSERT OR IGNORE INTO flipkart (product_name, price, rating, review_count, url, description, last_updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [(*row, timestamp) for row in FLIPKART_PRODUCTS])
+
     conn.commit()
     
     # Verify
@@ -10,11 +10,16 @@ os.chdir('c:\\Users\\grish\\Downloads\\amazon_flipkart')
 # Suppress detailed logging for this test
 logging.basicConfig(level=logging.WARNING)
 
+# UTF-8 output regardless of console code page - avoids the slow cp1252
+# fallback encoder on Windows
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
 from database import Database
 from amazon_scraper import AmazonScraper
 from flipkart_scraper import FlipkartScraper
 from main import find_best_matching_pair
-from utils import extract_product_details
+from utils import extract_product_details, extract_product_details_batch
 
 print("="*100)
 print("TESTING FULL APPLICATION WITH REAL SCRAPING")
@@ -46,18 +51,24 @@ print(f"Flipkart found {len(flipkart_results)} products")
 print("\n" + "="*100)
 print("AMAZON PRODUCTS:")
 print("="*100)
-for i, prod in enumerate(amazon_results[:3], 1):
-    base, color, storage, size, weight, dims, brand = extract_product_details(prod['product_name'])
-    print(f"\n{i}. {prod['product_name'][:70]}...")
-    print(f"   Color: '{color}' | Storage: {storage}GB | Price: ₹{prod['price']}")
+amazon_details = extract_product_details_batch([p['product_name'] for p in amazon_results[:3]])
+lines = []
+for i, (prod, details) in enumerate(zip(amazon_results, amazon_details), 1):
+    base, color, storage, size, weight, dims, brand = details
+    lines.append(f"\n{i}. {prod['product_name'][:70]}...")
+    lines.append(f"   Color: '{color}' | Storage: {storage}GB | Price: ₹{prod['price']}")
+sys.stdout.write('\n'.join(lines) + '\n' if lines else '')
 
 print("\n" + "="*100)
 print("FLIPKART PRODUCTS:")
 print("="*100)
-for i, prod in enumerate(flipkart_results[:3], 1):
-    base, color, storage, size, weight, dims, brand = extract_product_details(prod['product_name'])
-    print(f"\n{i}. {prod['product_name'][:70]}...")
-    print(f"   Color: '{color}' | Storage: {storage}GB | Price: ₹{prod['price']}")
+flipkart_details = extract_product_details_batch([p['product_name'] for p in flipkart_results[:3]])
+lines = []
+for i, (prod, details) in enumerate(zip(flipkart_results, flipkart_details), 1):
+    base, color, storage, size, weight, dims, brand = details
+    lines.append(f"\n{i}. {prod['product_name'][:70]}...")
+    lines.append(f"   Color: '{color}' | Storage: {storage}GB | Price: ₹{prod['price']}")
+sys.stdout.write('\n'.join(lines) + '\n' if lines else '')
 
 # Run matching algorithm
 print("\n" + "="*100)
@@ -1,37 +1,40 @@
 """Test with different thresholds to find optimal value"""
 import sqlite3
-from product_matcher import filter_products
+import sys
+from product_matcher import filter_products, prepare_corpus
+
+# UTF-8 output regardless of console code page - avoids the slow cp1252
+# fallback encoder on Windows
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8')
 
 def get_all_products():
     """Fetch all products from database"""
-    conn = sqlite3.connect('products.db')
-    conn.row_factory = sqlite3.Row
+    # Read-only open skips journal/lock setup, and mmap lets SQLite read
+    # pages straight from the page cache instead of read() syscalls
+    conn = sqlite3.connect('file:products.db?mode=ro', uri=True)
+    conn.execute("PRAGMA mmap_size=268435456")
     cursor = conn.cursor()
-    
-    all_products = []
-    
-    cursor.execute("SELECT product_name as name, price, rating, review_count, url FROM amazon")
-    for row in cursor.fetchall():
-        all_products.append({
-            'product_name': row['name'],
-            'source': 'Amazon',
-            'price': row['price'],
-            'rating': row['rating'],
-            'reviews': row['review_count'],
-            'url': row['url']
-        })
-    
-    cursor.execute("SELECT product_name as name, price, rating, review_count, url FROM flipkart")
-    for row in cursor.fetchall():
-        all_products.append({
-            'product_name': row['name'],
-            'source': 'Flipkart',
-            'price': row['price'],
-            'rating': row['rating'],
-            'reviews': row['review_count'],
-            'url': row['url']
-        })
-    
+
+    # One UNION ALL round-trip, plain tuple rows (faster than sqlite3.Row
+    # lookups), materialized in a single comprehension
+    cursor.execute(
+        "SELECT product_name, price, rating, review_count, url, 'Amazon' AS source FROM amazon "
+        "UNION ALL "
+        "SELECT product_name, price, rating, review_count, url, 'Flipkart' FROM flipkart"
+    )
+    all_products = [
+        {
+            'product_name': name,
+            'source': source,
+            'price': price,
+            'rating': rating,
+            'reviews': reviews,
+            'url': url
+        }
+        for name, price, rating, reviews, url, source in cursor.fetchall()
+    ]
+
     conn.close()
     return all_products
 
@@ -44,23 +47,29 @@ searches = {
 
 all_products = get_all_products()
 
+# Embed the whole catalog once; each query below then only encodes itself
+prepare_corpus(all_products)
+
 print("\n" + "="*75)
 print("PRODUCT MATCHER - THRESHOLD ANALYSIS")
 print("="*75)
 print(f"Total products in database: {len(all_products)}\n")
 
+# Accumulate result lines and flush once, instead of a write per product
+lines = []
 for search, threshold in searches.items():
-    print(f"Query: '{search}' (threshold: {threshold})")
-    print("-"*75)
+    lines.append(f"Query: '{search}' (threshold: {threshold})")
+    lines.append("-"*75)
     results = filter_products(search, all_products, similarity_threshold=threshold)
     if results:
         for r in results:
-            print(f"  [MATCH] {r['product_name']} ({r['source']}) - Rs{int(r['price']):,} - Score: {r['similarity_score']:.3f}")
+            lines.append(f"  [MATCH] {r['product_name']} ({r['source']}) - Rs{int(r['price']):,} - Score: {r['similarity_score']:.3f}")
     else:
-        print(f"  [NO MATCH] No products found with threshold {threshold}")
-    print()
+        lines.append(f"  [NO MATCH] No products found with threshold {threshold}")
+    lines.append("")
 
-print("="*75)
+lines.append("="*75)
+sys.stdout.write('\n'.join(lines) + '\n')
 print("\nNOTE:")
 print("  - 'iPhone 17 Pro' doesn't exist in DB (database has iPhone 14 & 15 only)")
 print("  - 'Samsung Galaxy' matches with lower threshold (0.65)")
@@ -41,6 +41,7 @@ def main():
     # Now import sentence_transformers for training
     logger.info("Importing sentence-transformers library...")
     try:
+        import torch
         from sentence_transformers import SentenceTransformer, InputExample, losses
         from torch.utils.data import DataLoader
         logger.info("✓ Imports successful\n")
@@ -48,8 +49,13 @@ def main():
         logger.error(f"✗ Import failed: {e}")
         logger.info("Installing required package...")
         os.system("pip install torch")
+        import torch
         from sentence_transformers import SentenceTransformer, InputExample, losses
         from torch.utils.data import DataLoader
+
+    # Mixed precision on GPU: autocast + GradScaler halve activation
+    # bytes and run the matmuls on tensor cores. No-op on CPU
+    use_amp = torch.cuda.is_available()
     
     # Configuration
     BASE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
@@ -58,15 +64,22 @@ def main():
     BATCH_SIZE = 16
     WARMUP_STEPS = 100
     
+    # Multi-GPU: under torchrun/accelerate each process gets WORLD_SIZE
+    # and the v3 trainer wires up DistributedDataParallel automatically
+    world_size = int(os.environ.get("WORLD_SIZE", "1"))
+
     logger.info(f"{'='*80}")
     logger.info("TRAINING CONFIGURATION")
     logger.info(f"{'='*80}")
     logger.info(f"Base Model:       {BASE_MODEL}")
     logger.info(f"Training Pairs:   {len(examples):,}")
     logger.info(f"Epochs:           {EPOCHS}")
-    logger.info(f"Batch Size:       {BATCH_SIZE}")
+    logger.info(f"Batch Size:       {BATCH_SIZE} (per device)")
     logger.info(f"Warmup Steps:     {WARMUP_STEPS}")
     logger.info(f"Output Dir:       {OUTPUT_DIR}")
+    logger.info(f"World Size:       {world_size}")
+    if world_size == 1:
+        logger.info(f"(Multi-GPU: torchrun --nproc_per_node=N train_final.py)")
     logger.info(f"{'='*80}\n")
     
     # Load base model
@@ -74,47 +87,87 @@ def main():
     model = SentenceTransformer(BASE_MODEL)
     logger.info(f"✓ Model loaded ({model.get_sentence_embedding_dimension()}-dim embeddings)\n")
     
-    # Prepare examples
-    logger.info("Preparing training examples...")
-    train_examples = [
-        InputExample(texts=[ex['sent1'], ex['sent2']], label=ex['label'])
-        for ex in examples
-    ]
-    logger.info(f"✓ {len(train_examples)} examples prepared\n")
-    
-    # Create data loader
-    logger.info("Creating data loader...")
-    train_dataloader = DataLoader(
-        train_examples,
-        shuffle=True,
-        batch_size=BATCH_SIZE
-    )
-    logger.info(f"✓ Data loader created ({len(train_dataloader)} batches)\n")
-    
     # Setup loss function
     logger.info("Setting up CosineSimilarityLoss...")
     train_loss = losses.CosineSimilarityLoss(model=model)
     logger.info("✓ Loss function ready\n")
-    
+
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
+
+    # DDP path: with more than one process, use the v3 trainer so each
+    # rank gets a DistributedSampler shard and gradients sync via NCCL
+    # ring-AllReduce. Falls back to the legacy fit if the trainer API is
+    # not available in the installed sentence-transformers
+    use_ddp = world_size > 1
+    if use_ddp:
+        try:
+            from sentence_transformers import (
+                SentenceTransformerTrainer,
+                SentenceTransformerTrainingArguments,
+            )
+            from datasets import Dataset
+        except ImportError as e:
+            logger.warning(f"⚠️ DDP trainer unavailable ({e}); training single-process")
+            use_ddp = False
+
     # Train
     logger.info(f"{'='*80}")
-    logger.info("STARTING FINE-TUNING")
+    logger.info("STARTING FINE-TUNING" + (f" (DDP x{world_size})" if use_ddp else ""))
     logger.info(f"{'='*80}\n")
-    
+
     start_time = datetime.now()
-    
-    model.fit(
-        train_objectives=[(train_dataloader, train_loss)],
-        epochs=EPOCHS,
-        warmup_steps=WARMUP_STEPS,
-        show_progress_bar=True,
-        checkpoint_save_steps=len(train_dataloader),
-        checkpoint_save_total_limit=1
-    )
-    
+
+    if use_ddp:
+        train_dataset = Dataset.from_dict({
+            'sentence1': [ex['sent1'] for ex in examples],
+            'sentence2': [ex['sent2'] for ex in examples],
+            'label': [ex['label'] for ex in examples],
+        })
+        args = SentenceTransformerTrainingArguments(
+            output_dir=os.path.join(OUTPUT_DIR, "checkpoints"),
+            num_train_epochs=EPOCHS,
+            per_device_train_batch_size=BATCH_SIZE,
+            warmup_steps=WARMUP_STEPS,
+            fp16=True,
+            ddp_backend="nccl",
+            save_total_limit=1,
+        )
+        trainer = SentenceTransformerTrainer(
+            model=model,
+            args=args,
+            train_dataset=train_dataset,
+            loss=train_loss
+        )
+        trainer.train()
+    else:
+        # Prepare examples
+        logger.info("Preparing training examples...")
+        train_examples = [
+            InputExample(texts=[ex['sent1'], ex['sent2']], label=ex['label'])
+            for ex in examples
+        ]
+        logger.info(f"✓ {len(train_examples)} examples prepared\n")
+
+        # Create data loader
+        logger.info("Creating data loader...")
+        train_dataloader = DataLoader(
+            train_examples,
+            shuffle=True,
+            batch_size=BATCH_SIZE
+        )
+        logger.info(f"✓ Data loader created ({len(train_dataloader)} batches)\n")
+
+        model.fit(
+            train_objectives=[(train_dataloader, train_loss)],
+            epochs=EPOCHS,
+            warmup_steps=WARMUP_STEPS,
+            show_progress_bar=True,
+            use_amp=use_amp,
+            checkpoint_save_steps=len(train_dataloader),
+            checkpoint_save_total_limit=1
+        )
+
     training_time = datetime.now() - start_time
     
     logger.info(f"\n{'='*80}")
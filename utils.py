@@ -131,6 +131,52 @@ def extract_product_variant(product_name):
     
     return (product_name, "")
 
+# Patterns for extract_product_details, compiled once at import instead of
+# per call (the color alternation alone is ~70 branches)
+_STORAGE_RE = re.compile(r'(\d+)\s*GB', re.IGNORECASE)
+_DASH_VARIANT_RE = re.compile(r'\s*-\s*([A-Za-z\s0-9]+)$')
+_SPEC_PREFIX_RE = re.compile(r'^\d+\s*(?:GB|MP|RAM)', re.IGNORECASE)
+_PAREN_VARIANT_RE = re.compile(r'\(([A-Za-z\s0-9]+)(?:,|\))')
+_WHITESPACE_RE = re.compile(r'\s+')
+_DIMENSIONS_RE = re.compile(
+    r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*(?:cm|mm|in|inch)',
+    re.IGNORECASE
+)
+_WEIGHT_RES = [
+    re.compile(r'(\d+\.?\d*)\s*(?:g|gm|gram)', re.IGNORECASE),
+    re.compile(r'(\d+\.?\d*)\s*(?:oz|ounce)', re.IGNORECASE),
+    re.compile(r'(\d+\.?\d*)\s*(?:ml|litre|liter)', re.IGNORECASE),
+]
+_SIZE_RES = [
+    re.compile(r'(\d+\.?\d*)\s*(?:oz|ounces)', re.IGNORECASE),
+    re.compile(r'(\d+\.?\d*)\s*(?:g|ml)', re.IGNORECASE),
+]
+
+# Comprehensive color name list - single and multi-word colors
+_COLOR_WORDS = [
+    # Multi-word colors (check these first)
+    r'Cosmic Orange', r'Deep Blue', r'Space Black', r'Midnight Black', r'Sierra Blue',
+    r'Desert Titanium', r'Natural Titanium', r'Blue Titanium', r'Black Titanium',
+    r'White Titanium', r'Pacific Blue', r'Alpine Green', r'Gold Titanium',
+    r'Silver Titanium', r'Dark Purple', r'Light Purple', r'Forest Green',
+    r'Ocean Blue', r'Sky Blue', r'Phantom Black', r'Phantom White',
+    r'Phantom Silver', r'Midnight Green', r'Product Red', r'Starlight Blue',
+    r'Starlight Green', r'Starlight Black', r'Starlight White', r'Glacier White',
+    r'Pearl White', r'Pearl Black', r'Marble White', r'Marble Black',
+    r'Space Gray', r'Space Grey',
+    # Single-word colors
+    r'Black', r'White', r'Silver', r'Gold', r'Red', r'Blue', r'Green',
+    r'Purple', r'Pink', r'Orange', r'Yellow', r'Brown', r'Grey', r'Gray',
+    r'Titanium', r'Rose', r'Pearl', r'Phantom', r'Midnight', r'Starlight',
+    r'Glacier', r'Alpine', r'Pacific', r'Desert', r'Cosmic', r'Space',
+    r'Sierra', r'Green', r'Ebony', r'Ivory', r'Marble', r'Onyx',
+]
+
+# One alternation, longest first so multi-word colors win over their parts
+_COLOR_RE = re.compile(
+    '|'.join(sorted(_COLOR_WORDS, key=len, reverse=True)), re.IGNORECASE
+)
+
 def extract_product_details(product_name):
     """
     Extract comprehensive product details from product name
@@ -182,44 +228,24 @@ def extract_product_details(product_name):
         base_name = ' '.join(words[:words_to_take])
     
     # Extract storage FIRST (e.g., "256 GB", "128GB")
-    storage_match = re.search(r'(\d+)\s*GB', product_name, re.IGNORECASE)
+    storage_match = _STORAGE_RE.search(product_name)
     if storage_match:
         storage = storage_match.group(1)
-    
-    # Define comprehensive color name list - single and multi-word colors
-    COLOR_WORDS = [
-        # Multi-word colors (check these first)
-        r'Cosmic Orange', r'Deep Blue', r'Space Black', r'Midnight Black', r'Sierra Blue',
-        r'Desert Titanium', r'Natural Titanium', r'Blue Titanium', r'Black Titanium',
-        r'White Titanium', r'Pacific Blue', r'Alpine Green', r'Gold Titanium',
-        r'Silver Titanium', r'Dark Purple', r'Light Purple', r'Forest Green',
-        r'Ocean Blue', r'Sky Blue', r'Phantom Black', r'Phantom White',
-        r'Phantom Silver', r'Midnight Green', r'Product Red', r'Starlight Blue',
-        r'Starlight Green', r'Starlight Black', r'Starlight White', r'Glacier White',
-        r'Pearl White', r'Pearl Black', r'Marble White', r'Marble Black',
-        r'Space Gray', r'Space Grey',
-        # Single-word colors
-        r'Black', r'White', r'Silver', r'Gold', r'Red', r'Blue', r'Green',
-        r'Purple', r'Pink', r'Orange', r'Yellow', r'Brown', r'Grey', r'Gray',
-        r'Titanium', r'Rose', r'Pearl', r'Phantom', r'Midnight', r'Starlight',
-        r'Glacier', r'Alpine', r'Pacific', r'Desert', r'Cosmic', r'Space',
-        r'Sierra', r'Green', r'Ebony', r'Ivory', r'Marble', r'Onyx',
-    ]
-    
+
     # Pattern 1: Amazon format "Product - Color Words" (after dash)
     # Captures everything after dash as potential color
-    dash_match = re.search(r'\s*-\s*([A-Za-z\s0-9]+)$', product_name)
+    dash_match = _DASH_VARIANT_RE.search(product_name)
     if dash_match:
         potential_color = dash_match.group(1).strip()
         # Only accept if it doesn't look like specs (GB, MP, etc)
-        if not re.search(r'^\d+\s*(?:GB|MP|RAM)', potential_color, re.IGNORECASE):
+        if not _SPEC_PREFIX_RE.search(potential_color):
             color = potential_color
             base_name = product_name[:dash_match.start()].strip()
-    
+
     # Pattern 2: Flipkart format "Product (Color Words, GB)" or "Product (Color Words)"
     # This pattern extracts the first parenthetical content as color
     if not color:  # Only if we haven't found color yet
-        paren_match = re.search(r'\(([A-Za-z\s0-9]+)(?:,|\))', product_name)
+        paren_match = _PAREN_VARIANT_RE.search(product_name)
         if paren_match:
             potential_color = paren_match.group(1).strip()
             # Filter out technical specs that aren't colors
@@ -233,10 +259,7 @@ def extract_product_details(product_name):
     # Pattern 3: Look for color in text like "iPhone 17 Pro Cosmic Orange 256GB"
     # Check for known color names in the product name
     if not color:
-        # Build regex pattern from all known colors (longest first to match multi-word colors first)
-        sorted_colors = sorted(COLOR_WORDS, key=len, reverse=True)
-        color_pattern = '|'.join(sorted_colors)
-        color_match = re.search(color_pattern, product_name, re.IGNORECASE)
+        color_match = _COLOR_RE.search(product_name)
         if color_match:
             color = color_match.group(0).strip()
             # Normalize capitalization
@@ -244,38 +267,40 @@ def extract_product_details(product_name):
             # IMPORTANT: Update base_name to remove the color from it
             base_name = (product_name[:color_match.start()] + ' ' + product_name[color_match.end():]).strip()
             # Clean up any double spaces or semicolons at boundaries
-            base_name = re.sub(r'\s+', ' ', base_name.replace(';', ' ')).strip()
-    
+            base_name = _WHITESPACE_RE.sub(' ', base_name.replace(';', ' ')).strip()
+
     # Extract weight (e.g., "50g", "1.5 oz", "100ml")
-    weight_patterns = [
-        r'(\d+\.?\d*)\s*(?:g|gm|gram)',
-        r'(\d+\.?\d*)\s*(?:oz|ounce)',
-        r'(\d+\.?\d*)\s*(?:ml|litre|liter)',
-    ]
-    for pattern in weight_patterns:
-        weight_match = re.search(pattern, product_name, re.IGNORECASE)
+    for pattern in _WEIGHT_RES:
+        weight_match = pattern.search(product_name)
         if weight_match:
             weight = weight_match.group(0).strip()
             break
-    
+
     # Extract package size
-    size_patterns = [
-        r'(\d+\.?\d*)\s*(?:oz|ounces)',
-        r'(\d+\.?\d*)\s*(?:g|ml)',
-    ]
-    for pattern in size_patterns:
-        size_match = re.search(pattern, product_name, re.IGNORECASE)
+    for pattern in _SIZE_RES:
+        size_match = pattern.search(product_name)
         if size_match:
             size = size_match.group(1)
             break
-    
+
     # Extract dimensions (e.g., "10x20x5 cm")
-    dimensions_match = re.search(r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*(?:cm|mm|in|inch)', product_name, re.IGNORECASE)
+    dimensions_match = _DIMENSIONS_RE.search(product_name)
     if dimensions_match:
         dimensions = f"{dimensions_match.group(1)}x{dimensions_match.group(2)}x{dimensions_match.group(3)}"
-    
+
     return (base_name, color, storage, size, weight, dimensions, brand)
 
+def extract_product_details_batch(product_names):
+    """
+    Extract details for a whole list of product names in one pass
+    Args:
+        product_names: List of product name strings
+    Returns:
+        list: One (base_name, color, storage, size, weight, dimensions, brand)
+              tuple per input name, in order
+    """
+    return [extract_product_details(name) for name in product_names]
+
 def detect_product_category(product_name):
     """
     Detect product category to avoid mismatches (e.g., phone vs phone cover)